@@ -0,0 +1,191 @@
+import tkinter as tk
+from bisect import insort
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+
+from Grooming_Schedule import GroomingRule, WEEKDAYS
+
+MONTH_LINES = 3 # events shown in a month cell, then "+n more"
+WEEK_LINES = 14 # events shown in a week cell
+GRID_ROWS = 6 # a month never spans more than 6 weeks
+
+
+# -------------------------
+#     DAY BUCKET INDEX
+# -------------------------
+class CalendarIndex:
+    # Day buckets: date ordinal -> sorted list of (sort key, text) for vet
+    # appointments and grooming tasks. A month is filled the first time it is
+    # shown, from the vet date index and the grooming date index (both bisect
+    # ranges), and repeating grooming tasks are expanded for that month only.
+    # Listener calls keep filled months current, so drawing a month reads
+    # about 31 buckets instead of scanning both data sets.
+    def __init__(self, vet_logic, grooming):
+        self.vet = vet_logic
+        self.grooming = grooming # Grooming_Schedule.get_grooming()
+        self.buckets = {}
+        self.loaded = set() # (year, month) already filled
+
+        vet_logic.listeners.append(self.vet_changed)
+        grooming.listeners.append(self.grooming_changed)
+
+    def day(self, day): # events on one date, by time
+        self.fill(day.year, day.month)
+        return self.buckets.get(day.toordinal(), [])
+
+    def fill(self, year, month):
+        if (year, month) in self.loaded:
+            return
+        self.loaded.add((year, month))
+        first, end = month_range(year, month)
+
+        ids = self.vet.between(first.isoformat(), (end - timedelta(days=1)).isoformat())
+        for item in self.vet.get_items(ids):
+            self.add(vet_event(item))
+
+        start_dt, end_dt = datetime.combine(first, time()), datetime.combine(end, time())
+        table = self.grooming.table
+        for row in table.rows_between(start_dt, end_dt):
+            task = table[row]
+            self.add(grooming_event(task, task.when))
+        for rule in self.grooming.rules:
+            for when in rule.occurrences(start_dt, end_dt):
+                self.add(grooming_event(rule, when))
+
+    def is_loaded(self, day):
+        return (day.year, day.month) in self.loaded
+
+    def add(self, event):
+        if event is not None:
+            insort(self.buckets.setdefault(event[0], []), event[1:])
+
+    def remove(self, event):
+        if event is None:
+            return
+        bucket = self.buckets.get(event[0], [])
+        if event[1:] in bucket:
+            bucket.remove(event[1:])
+
+    def vet_changed(self, old, new): # listener, old/new [id, pet, date, clinic, notes]
+        for item, change in ((old, self.remove), (new, self.add)):
+            event = vet_event(item) if item is not None else None
+            if event is not None and self.is_loaded(date.fromordinal(event[0])):
+                change(event)
+
+    def grooming_changed(self, old, new): # listener, old/new GroomingTask or GroomingRule
+        for item, change in ((old, self.remove), (new, self.add)):
+            if item is None:
+                continue
+            if isinstance(item, GroomingRule): # every occurrence in the filled months
+                for year, month in self.loaded:
+                    first, end = month_range(year, month)
+                    for when in item.occurrences(datetime.combine(first, time()), datetime.combine(end, time())):
+                        change(grooming_event(item, when))
+            elif isinstance(item.when, datetime) and self.is_loaded(item.when.date()):
+                change(grooming_event(item, item.when))
+
+
+def month_range(year, month): # first day and the day after the last
+    first = date(year, month, 1)
+    return first, first + timedelta(days=monthrange(year, month)[1])
+
+
+def vet_event(item): # (ordinal, sort key, text) or None for a bad date
+    try:
+        day = date.fromisoformat(item[2])
+    except ValueError:
+        return None
+    return day.toordinal(), "", f"Vet: {item[1]} ({item[3]})"
+
+
+def grooming_event(item, when):
+    return when.toordinal(), when.strftime("%H:%M"), f"{when:%H:%M} {item.pet}: {item.task}"
+
+
+# -------------------------
+#        GUI CLASS
+# -------------------------
+class CalendarApp:
+    def __init__(self, master, index):
+        self.master = master
+        self.index = index
+        self.mode = tk.StringVar(value="month")
+        self.anchor = date.today() # the month/week on screen contains this day
+
+        # navigation bar
+        nav = tk.Frame(self.master)
+        nav.pack(fill="x", padx=10, pady=8)
+        tk.Button(nav, text="<", width=3, command=lambda: self.move(-1)).pack(side="left")
+        self.title = tk.Label(nav, font=("Arial", 14, "bold"), width=22)
+        self.title.pack(side="left", padx=5)
+        tk.Button(nav, text=">", width=3, command=lambda: self.move(1)).pack(side="left")
+        tk.Button(nav, text="Today", command=self.go_today).pack(side="left", padx=10)
+        tk.Radiobutton(nav, text="Week", value="week", variable=self.mode,
+                       command=self.show).pack(side="right")
+        tk.Radiobutton(nav, text="Month", value="month", variable=self.mode,
+                       command=self.show).pack(side="right")
+
+        # 6 x 7 cells made once, moving between months only changes their text
+        grid = tk.Frame(self.master)
+        grid.pack(fill="both", expand=True, padx=10)
+        for col, name in enumerate(WEEKDAYS):
+            tk.Label(grid, text=name, font=("Arial", 10, "bold")).grid(row=0, column=col)
+            grid.columnconfigure(col, weight=1, uniform="day")
+        self.cells = []
+        for row in range(GRID_ROWS):
+            grid.rowconfigure(row + 1, weight=1)
+            for col in range(7):
+                cell = tk.Frame(grid, bd=1, relief="solid")
+                cell.grid(row=row + 1, column=col, sticky="nsew")
+                number = tk.Label(cell, anchor="ne", font=("Arial", 10, "bold"))
+                number.pack(fill="x")
+                events = tk.Label(cell, anchor="nw", justify="left", font=("Arial", 8), wraplength=78)
+                events.pack(fill="both", expand=True)
+                self.cells.append({"frame": cell, "number": number, "events": events})
+
+        self.show()
+
+    def move(self, step): # previous/next month or week
+        if self.mode.get() == "week":
+            self.anchor += timedelta(days=7 * step)
+        else:
+            year, month = divmod(self.anchor.year * 12 + self.anchor.month - 1 + step, 12)
+            self.anchor = date(year, month + 1, 1)
+        self.show()
+
+    def go_today(self):
+        self.anchor = date.today()
+        self.show()
+
+    def show(self):
+        week = self.mode.get() == "week"
+        if week:
+            start = self.anchor - timedelta(days=self.anchor.weekday())
+            rows, lines = 1, WEEK_LINES
+            end = start + timedelta(days=6)
+            self.title.config(text=f"{start:%d %b} - {end:%d %b %Y}")
+        else:
+            first = self.anchor.replace(day=1)
+            start = first - timedelta(days=first.weekday())
+            rows, lines = GRID_ROWS, MONTH_LINES
+            self.title.config(text=f"{first:%B %Y}")
+
+        today = date.today()
+        for i, cell in enumerate(self.cells):
+            if i >= rows * 7:
+                cell["frame"].grid_remove()
+                continue
+            cell["frame"].grid()
+            day = start + timedelta(days=i)
+            in_month = week or day.month == self.anchor.month
+            cell["number"].config(text=str(day.day), fg="black" if in_month else "grey",
+                                  bg="#ffe08a" if day == today else cell["frame"].cget("bg"))
+            cell["events"].config(text=cell_text(self.index.day(day), lines),
+                                  fg="black" if in_month else "grey")
+
+
+def cell_text(events, lines): # first `lines` events, then "+n more"
+    text = [event[1] for event in events[:lines]]
+    if len(events) > lines:
+        text.append(f"+{len(events) - lines} more")
+    return "\n".join(text)
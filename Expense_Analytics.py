@@ -0,0 +1,225 @@
+import numpy as np
+
+from Pet_Expense_Tracker import EXP_FILE, CATEGORIES, read_expense_rows
+
+
+def parse_days(date_strs):
+    # "YYYY-MM-DD" strings -> datetime64[D], bad dates become NaT
+    try:
+        return np.array(date_strs, dtype="datetime64[D]")
+    except ValueError:
+        days = np.empty(len(date_strs), dtype="datetime64[D]")
+        for i, text in enumerate(date_strs):
+            try:
+                days[i] = np.datetime64(text, "D")
+            except ValueError:
+                days[i] = np.datetime64("NaT")
+        return days
+
+
+class ExpenseColumns:
+    # Column arrays for the expense rows "id|date|name|category|amount":
+    #   days  - date as days since 1970-01-01 (int32)
+    #   cat   - index into self.categories (int8)
+    #   pet   - index into self.pets, names are interned lower-case (int32)
+    #   cents - amount in whole cents (int64)
+    # Every question below is answered with NumPy on these arrays instead
+    # of a Python loop over rows.
+    def __init__(self, days, cat, pet, cents, categories, pets):
+        self.days = days
+        self.cat = cat
+        self.pet = pet
+        self.cents = cents
+        self.categories = categories
+        self.pets = pets
+
+        # Months since 1970-01, used for monthly and yearly grouping
+        self.months = days.astype("datetime64[D]").astype(
+            "datetime64[M]").astype(np.int32)
+        self.year_of = self.months // 12 + 1970
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows are lists of strings as returned by load_records()
+        if not rows:
+            return cls.empty()
+        days = parse_days([row[1] for row in rows])
+        names = np.array([row[2].lower() for row in rows])
+        cats = np.array([row[3] for row in rows])
+        amount_strs = [row[4] for row in rows]
+        try:
+            amounts = np.array(amount_strs).astype(np.float64)
+        except ValueError:
+            amounts = np.array([to_float(a) for a in amount_strs])
+        cents = np.rint(amounts * 100).astype(np.int64)
+        return cls.build(days, names, cats, cents)
+
+    @classmethod
+    def from_store(cls, store):
+        # Build from an ExpenseStore already in memory
+        records = store.all()
+        if not records:
+            return cls.empty()
+        days = parse_days([exp.date for exp in records])
+        names = np.array([exp.name.lower() for exp in records])
+        cats = np.array([exp.category for exp in records])
+        cents = np.fromiter((exp.cents for exp in records),
+                            dtype=np.int64, count=len(records))
+        return cls.build(days, names, cats, cents)
+
+    @classmethod
+    def from_file(cls, path=EXP_FILE):
+        return cls.from_rows(read_expense_rows(path))
+
+    @classmethod
+    def build(cls, days, names, cats, cents):
+        # Drop rows with a bad date, then intern names and categories
+        ok = ~np.isnat(days)
+        days, names, cats, cents = days[ok], names[ok], cats[ok], cents[ok]
+
+        # Known categories keep their CATEGORIES order, others follow
+        labels, inverse = np.unique(cats, return_inverse=True)
+        labels = labels.tolist()
+        categories = CATEGORIES + sorted(set(labels) - set(CATEGORIES))
+        lookup = np.array([categories.index(c) for c in labels], dtype=np.int8)
+        cat = lookup[inverse]
+
+        pets, pet = np.unique(names, return_inverse=True)
+        return cls(days.astype(np.int32), cat, pet.astype(np.int32), cents,
+                   categories, pets.tolist())
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, np.int32), np.zeros(0, np.int8),
+                   np.zeros(0, np.int32), np.zeros(0, np.int64),
+                   list(CATEGORIES), [])
+
+    def __len__(self):
+        return len(self.cents)
+
+    # -------------------------
+    #        QUERIES
+    # -------------------------
+
+    def years(self):
+        return np.unique(self.year_of).tolist()
+
+    def year_mask(self, year):
+        return self.year_of == year
+
+    def group_by(self, key, mask=None):
+        # Total cents per category / pet / month / year -> {label: cents}
+        if key == "category":
+            codes, labels = self.cat, self.categories
+        elif key == "pet":
+            codes, labels = self.pet, self.pets
+        elif key == "month":
+            return self.monthly_spend(mask)
+        elif key == "year":
+            base = self.year_of
+            start = int(base.min()) if len(base) else 1970
+            codes = base - start
+            labels = [str(start + i) for i in range(int(codes.max()) + 1)] if len(base) else []
+        else:
+            raise ValueError(f"Unknown group key: {key}")
+
+        cents = self.cents
+        if mask is not None:
+            codes, cents = codes[mask], cents[mask]
+        totals = np.bincount(codes, weights=cents, minlength=len(labels))
+        return {labels[i]: int(round(t)) for i, t in enumerate(totals) if t != 0}
+
+    def monthly_series(self, mask=None):
+        # Total cents for every month from first to last -> (months, totals)
+        months, cents = self.months, self.cents
+        if mask is not None:
+            months, cents = months[mask], cents[mask]
+        if len(months) == 0:
+            return np.zeros(0, np.int32), np.zeros(0, np.int64)
+        first = int(months.min())
+        totals = np.bincount(months - first, weights=cents)
+        return np.arange(first, first + len(totals)), np.rint(totals).astype(np.int64)
+
+    def monthly_spend(self, mask=None):
+        months, totals = self.monthly_series(mask)
+        return {month_label(m): int(t) for m, t in zip(months, totals)}
+
+    def rolling_monthly(self, window=3, mask=None):
+        # Rolling sum of monthly spend over `window` months (cumsum trick)
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        months, totals = self.monthly_series(mask)
+        sums = np.cumsum(totals)
+        sums[window:] = sums[window:] - sums[:-window]
+        return {month_label(m): int(t) for m, t in zip(months, sums)}
+
+    def percentiles(self, qs=(50, 90, 99), by=None, mask=None):
+        # Percentiles of single expense amounts (in RM)
+        # by=None for all rows, or by="category" for one set per category
+        amounts = self.cents / 100
+        cat = self.cat
+        if mask is not None:
+            amounts, cat = amounts[mask], cat[mask]
+        if by is None:
+            if len(amounts) == 0:
+                return {}
+            return dict(zip(qs, np.percentile(amounts, qs).tolist()))
+        if by != "category":
+            raise ValueError(f"Unknown percentile group: {by}")
+        result = {}
+        for code, label in enumerate(self.categories):
+            values = amounts[cat == code]
+            if len(values):
+                result[label] = dict(zip(qs, np.percentile(values, qs).tolist()))
+        return result
+
+    def yearly_report(self, years=None):
+        # One summary per year, all from array operations
+        report = {}
+        for year in (years or self.years()):
+            mask = self.year_mask(year)
+            count = int(mask.sum())
+            if count == 0:
+                continue
+            report[year] = {
+                "total": int(self.cents[mask].sum()),
+                "count": count,
+                "by_category": self.group_by("category", mask),
+                "by_month": self.monthly_spend(mask),
+                "top_pets": top_n(self.group_by("pet", mask), 3),
+                "percentiles": self.percentiles(mask=mask),
+            }
+        return report
+
+
+def to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def month_label(month_code):
+    # months since 1970-01 -> "YYYY-MM"
+    month_code = int(month_code)
+    return f"{month_code // 12 + 1970}-{month_code % 12 + 1:02d}"
+
+
+def top_n(totals, n):
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def format_report(report):
+    # Report dict -> list of text lines for the GUI
+    lines = []
+    for year, info in report.items():
+        lines.append(f"{year}: RM {info['total'] / 100:.2f} ({info['count']} records)")
+        for cat, cents in info["by_category"].items():
+            lines.append(f"  {cat}: RM {cents / 100:.2f}")
+        for name, cents in info["top_pets"]:
+            lines.append(f"  Top pet {name}: RM {cents / 100:.2f}")
+        pct = info["percentiles"]
+        if pct:
+            lines.append("  Median RM {:.2f} | P90 RM {:.2f}".format(pct[50], pct[90]))
+        lines.append("")
+    return lines
@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from Feeding_Tracker import FeedingStore, Pet, Schedule
+
+# Memory of the Feeding Tracker models for a large kennel, the slotted Pet and
+# Schedule against the plain classes they replaced. Both are built from split
+# file lines like the loader does, so every row starts with its own strings.
+# Then the time and peak memory of FeedingStore.load on a file of that size,
+# which only reads schedules into memory for the pets that are opened.
+# Run: python Feeding_Benchmark.py [pets] [schedules per pet]
+
+FOODS = ["Kibble", "Wet Food", "Fish", "Chicken", "Rice Mix", "Hay", "Seeds", "Pellets"]
+AMOUNTS = [0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.5, 1.0]
+
+
+# the models before __slots__, for comparison
+class PlainPet:
+    def __init__(self, name, age, weight):
+        self.name = name
+        self.age = age
+        self.weight = weight
+        self.schedules = []
+
+
+class PlainSchedule:
+    def __init__(self, time, food, amount):
+        self.time_str = time
+        self.food = food
+        self.amount = amount
+
+
+def make_lines(pets, per_pet):
+    rng = random.Random(1)
+    lines = []
+    for i in range(pets):
+        lines.append(f"PET|Pet{i}|{rng.randint(1, 15)}|{rng.randint(2, 400) / 10}")
+        for _ in range(per_pet):
+            lines.append(f"SCHEDULE|{rng.randint(0, 23):02d}:{rng.choice((0, 15, 30, 45)):02d}|"
+                         f"{rng.choice(FOODS)}|{rng.choice(AMOUNTS)}")
+    return lines
+
+
+def build(lines, pet_class, schedule_class):
+    pets = []
+    for line in lines:
+        parts = line.split("|")
+        if parts[0] == "PET":
+            pet = pet_class(parts[1], int(parts[2]), float(parts[3]))
+            pets.append(pet)
+        else:
+            pet.schedules.append(schedule_class(parts[1], parts[2], float(parts[3])))
+    return pets
+
+
+def measure(lines, pet_class, schedule_class):
+    tracemalloc.start()
+    pets = build(lines, pet_class, schedule_class)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del pets
+    return size
+
+
+def measure_load(lines): # (seconds, peak bytes) to load a feeding file with these lines
+    folder = tempfile.mkdtemp()
+    filename = os.path.join(folder, "feeding_data.txt")
+    with open(filename, "w") as f:
+        f.write("".join(line + "\n" for line in lines))
+    store = FeedingStore(filename)
+    tracemalloc.start()
+    start = time.perf_counter()
+    store.load()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    os.remove(filename)
+    os.rmdir(folder)
+    return seconds, peak
+
+
+if __name__ == "__main__":
+    import sys
+    pets = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    per_pet = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    lines = make_lines(pets, per_pet)
+    rows = pets * (per_pet + 1)
+
+    plain = measure(lines, PlainPet, PlainSchedule)
+    slotted = measure(lines, Pet, Schedule)
+    print(f"{pets} pets, {pets * per_pet} schedules")
+    print(f"plain classes : {plain / 1024 / 1024:7.2f} MB ({plain / rows:.0f} bytes a row)")
+    print(f"__slots__     : {slotted / 1024 / 1024:7.2f} MB ({slotted / rows:.0f} bytes a row)")
+    print(f"reduction     : {100 * (1 - slotted / plain):.0f}%")
+
+    seconds, peak = measure_load(lines)
+    print(f"load          : {seconds * 1000:7.1f} ms, peak {peak / 1024 / 1024:.2f} MB")
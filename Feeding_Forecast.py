@@ -0,0 +1,184 @@
+import math
+import os
+from datetime import date
+
+import numpy as np
+
+from Feeding_Tracker import get_feeding
+
+STOCK_FILE = "food_stock.txt" # food|kg|YYYY-MM-DD the stock was counted
+
+
+class FoodForecast:
+    # Daily kg per food across all pets, as column arrays indexed by food code:
+    #   daily   - kg fed per day (every schedule runs once a day)
+    #   count   - number of schedules using the food
+    #   stock   - kg in stock when last counted, NaN if never counted
+    #   counted - date ordinal of that count
+    # The first build sums the feeding index totals with np.bincount. After
+    # that the store's listeners add or subtract one schedule's amount, and
+    # only the foods touched have their depletion date worked out again.
+    def __init__(self, store, stock_file=STOCK_FILE):
+        self.store = store
+        self.stock_file = stock_file
+        self.foods = [] # code -> food name
+        self.code = {} # food name -> code
+        self.daily = np.zeros(0)
+        self.count = np.zeros(0, np.int64)
+        self.stock = np.zeros(0)
+        self.counted = np.zeros(0, np.int64)
+        self.runs_out = {} # food -> date ordinal or None, cached
+        self.stale = set() # codes whose runs_out entry is out of date
+
+        self.build()
+        self.load_stock()
+        store.listeners.append(self.schedule_changed)
+
+    def build(self):
+        # per-minute food totals of the index -> per-food daily totals
+        names, kg, counts = [], [], []
+        for slot in self.store.index.food:
+            if slot:
+                for food, total in slot.items():
+                    names.append(food)
+                    kg.append(total[0])
+                    counts.append(total[1])
+        for food in dict.fromkeys(names):
+            self.food_code(food)
+        codes = np.fromiter((self.code[food] for food in names), dtype=np.int64, count=len(names))
+        kg = np.array(kg, dtype=np.float64)
+        ok = np.isfinite(kg) # the index leaves nan/inf amounts out, this is a guard
+        self.daily[:] = np.bincount(codes[ok], weights=kg[ok], minlength=len(self.foods))
+        self.count[:] = np.bincount(codes[ok], weights=np.array(counts, dtype=np.float64)[ok],
+                                    minlength=len(self.foods))
+        self.stale.update(range(len(self.foods)))
+
+    def food_code(self, food): # code for a food, new foods get a column
+        code = self.code.get(food)
+        if code is None:
+            code = len(self.foods)
+            self.foods.append(food)
+            self.code[food] = code
+            self.daily = np.append(self.daily, 0.0)
+            self.count = np.append(self.count, 0)
+            self.stock = np.append(self.stock, np.nan)
+            self.counted = np.append(self.counted, 0)
+        return code
+
+    def schedule_changed(self, pet, old, new): # FeedingStore listener
+        for schedule, sign in ((old, -1), (new, 1)):
+            if schedule is None or schedule.minute is None or not math.isfinite(schedule.amount):
+                continue # the index skips these too
+            code = self.food_code(schedule.food)
+            self.count[code] += sign
+            self.daily[code] += sign * schedule.amount
+            if self.count[code] == 0:
+                self.daily[code] = 0.0 # no rounding left over
+            self.stale.add(code)
+
+    # -------------------------
+    #          STOCK
+    # -------------------------
+
+    def set_stock(self, food, kg, day=None): # kg in stock on day (today by default)
+        if not math.isfinite(kg) or kg < 0:
+            raise ValueError("stock must be a finite number >= 0")
+        code = self.food_code(food)
+        self.stock[code] = kg
+        self.counted[code] = (day or date.today()).toordinal()
+        self.stale.add(code)
+        self.save_stock()
+
+    def load_stock(self):
+        try:
+            with open(self.stock_file, "r") as f:
+                for line in f:
+                    parts = line.strip().split("|")
+                    try:
+                        kg, day = float(parts[1]), date.fromisoformat(parts[2])
+                    except (ValueError, IndexError):
+                        continue
+                    if not math.isfinite(kg) or kg < 0:
+                        continue
+                    code = self.food_code(parts[0])
+                    self.stock[code] = kg
+                    self.counted[code] = day.toordinal()
+                    self.stale.add(code)
+        except FileNotFoundError:
+            pass
+
+    def save_stock(self): # small file, rewritten whole and swapped in
+        temp_name = self.stock_file + ".tmp"
+        with open(temp_name, "w") as f:
+            for code in np.flatnonzero(~np.isnan(self.stock)).tolist():
+                day = date.fromordinal(int(self.counted[code]))
+                f.write(f"{self.foods[code]}|{self.stock[code]:g}|{day.isoformat()}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, self.stock_file)
+
+    # -------------------------
+    #         FORECAST
+    # -------------------------
+
+    def refresh(self):
+        # Depletion date for the stale foods only: the stock lasts
+        # stock / daily days from the day it was counted. Dates past
+        # date.max are clamped to it, "not within forecast range".
+        if not self.stale:
+            return
+        codes = np.array(sorted(self.stale), dtype=np.int64)
+        daily, stock, counted = self.daily[codes], self.stock[codes], self.counted[codes]
+        ok = (daily > 0) & ~np.isnan(stock)
+        last = date.max.toordinal()
+        days = np.zeros(len(codes))
+        days[ok] = np.floor(stock[ok] / daily[ok])
+        ends = counted + np.minimum(days, last - counted).astype(np.int64)
+        for code, end, known in zip(codes.tolist(), ends.tolist(), ok.tolist()):
+            self.runs_out[self.foods[code]] = end if known else None
+        self.stale.clear()
+
+    def report(self):
+        # [(food, kg/day, kg/week, stock kg or None, runs out date or None)],
+        # foods still fed or in stock, soonest to run out first
+        self.refresh()
+        rows = []
+        for code in np.flatnonzero((self.count > 0) | ~np.isnan(self.stock)).tolist():
+            food = self.foods[code]
+            stock = None if np.isnan(self.stock[code]) else float(self.stock[code])
+            end = self.runs_out.get(food)
+            rows.append((food, float(self.daily[code]), float(self.daily[code]) * 7, stock,
+                         date.fromordinal(end) if end is not None else None))
+        rows.sort(key=lambda row: (row[4] is None, row[4] or date.max, row[0]))
+        return rows
+
+
+def format_forecast(rows, today=None):
+    # report() rows -> list of text lines for the GUI
+    today = today or date.today()
+    lines = []
+    for food, daily, weekly, stock, runs_out in rows:
+        lines.append(f"{food}: {daily:.2f} kg/day, {weekly:.2f} kg/week")
+        if stock is None:
+            lines.append("  Stock not counted")
+        elif runs_out is None:
+            lines.append(f"  Stock {stock:g} kg, not used by any schedule")
+        elif runs_out == date.max:
+            lines.append(f"  Stock {stock:g} kg, not within forecast range")
+        elif runs_out <= today:
+            lines.append(f"  Stock {stock:g} kg, ran out on {runs_out.isoformat()}")
+        else:
+            days = (runs_out - today).days
+            lines.append(f"  Stock {stock:g} kg, runs out {runs_out.isoformat()} ({days} days)")
+    return lines
+
+
+# One forecast per run, kept current by the shared store's listeners
+_forecast = None
+
+
+def get_forecast():
+    global _forecast
+    if _forecast is None:
+        _forecast = FoodForecast(get_feeding())
+    return _forecast
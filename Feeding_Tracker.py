@@ -1,13 +1,52 @@
+import atexit
+import math
+import os
+import queue
+import sys
+import threading
 import tkinter as tk
+from bisect import bisect_left, insort
 from tkinter import messagebox
 
+FEEDING_FILE = "feeding_data.txt"
+AUTOSAVE_DELAY_MS = 1000 # autosave this long after the last change
+COMPACT_BLOCKS = 200 # rewrite the whole file on load once the log has this many pet blocks
+DAY_MINUTES = 1440
+
 # Pet 
 class Pet:
-    def __init__(self, name, age, weight): # Stores the pet information 
+    # __slots__: no per-pet __dict__, a kennel has thousands of pets
+    __slots__ = ("name", "age", "weight", "_schedules", "source", "offset", "pid", "dirty")
+
+    def __init__(self, name, age, weight, pid=None): # Stores the pet information 
         self.name = name  
         self.age = age # Pet's age 
         self.weight = weight  # Pet"s weight in kg
-        self.schedules = []  # feeding records
+        self._schedules = []  # feeding records, None until read (see schedules)
+        self.source = None # file and byte offset of the schedule lines, for a pet loaded lazily
+        self.offset = 0
+        self.pid = pid # stable ID, given by FeedingStore
+        self.dirty = False # changed since the last autosave
+
+    @property
+    def schedules(self): # read from the file the first time they are needed
+        if self._schedules is None:
+            self._schedules = read_schedules(self.source, self.offset)
+        return self._schedules
+
+    def add_schedule(self, schedule):
+        self.schedules.append(schedule)
+        self.dirty = True
+
+    def remove_schedule(self, index):
+        del self.schedules[index]
+        self.dirty = True
+
+    def to_lines(self): # the file block for this pet
+        lines = [f"PET|{self.name}|{self.age}|{self.weight}|{self.pid}"]
+        for s in self.schedules:
+            lines.append(f"SCHEDULE|{s.time_str}|{s.food}|{s.amount}")
+        return lines
 
     def show_info(self): # Returns full information of the pet, including all feeding schedules.
         return f"{self.name} | Age: {self.age} | Weight: {self.weight}kg" 
@@ -24,37 +63,447 @@ class Pet:
 
 # Schedule
 class Schedule:
+    # __slots__, the time kept as an int and food/amount shared between
+    # schedules, as there are tens of thousands of them
+    __slots__ = ("time", "food", "amount")
+
     def __init__(self, time, food, amount):
-        self.time_str = time # Feeding time as a string in HH:MM format.
-        self.food = food # Name of the food
-        self.amount = amount # Amount of food in kilograms
+        minute = time_to_minute(time)
+        self.time = minute if minute is not None else time # minute of day 0-1439, or the raw text if invalid
+        self.food = sys.intern(food) # Name of the food, one copy per name
+        self.amount = _amounts.setdefault(amount, amount) # Amount of food in kilograms, one float per value
+
+    @property
+    def minute(self): # minute of day, None if the time was invalid
+        return self.time if isinstance(self.time, int) else None
+
+    @property
+    def time_str(self): # Feeding time as a string in HH:MM format.
+        return minute_to_time(self.time) if isinstance(self.time, int) else self.time
     
     def show_row(self):
         return f"{self.time_str} | {self.food} | {self.amount}kg"
 
+_amounts = {} # amount -> the shared float object
+
+
 # Time format validation 
 def valid_time(t):
+    return time_to_minute(t) is not None
+
+
+# "HH:MM" -> minute of day (0-1439), None if the format is wrong
+def time_to_minute(t):
     if ":" not in t: # Check if the string contains :
-        return False
+        return None
     parts = t.split(":") # Split the string by : ensure are hour and minute.
     
     if len(parts) != 2:
-        return False
+        return None
     hour_str, minute_str = parts
 
     if not hour_str.isdigit() or not minute_str.isdigit(): # Check if both parts are digits.
-        return False
+        return None
     
     hour = int(hour_str) # Convert the parts to hour
     minute = int(minute_str) # Convert the parts to minute
-    return 0 <= hour <= 23 and 0 <= minute <= 59 # Validate ranges: hour 0–23, minute 0–59.
+    if 0 <= hour <= 23 and 0 <= minute <= 59: # Validate ranges: hour 0–23, minute 0–59.
+        return hour * 60 + minute
+    return None
+
+
+def minute_to_time(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+# SCHEDULE line parts -> Schedule, None if the amount is not a number
+def parse_schedule(parts):
+    if len(parts) < 4:
+        return None
+    try:
+        return Schedule(parts[1], parts[2], float(parts[3]))
+    except ValueError:
+        return None
+
+
+# one pet's schedules, from the line at offset up to the next PET line
+def read_schedules(filename, offset):
+    schedules = []
+    with open(filename, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            parts = raw.decode("utf-8").strip().split("|")
+            if parts[0] == "PET":
+                break
+            if parts[0] == "SCHEDULE":
+                schedule = parse_schedule(parts)
+                if schedule is not None:
+                    schedules.append(schedule)
+    return schedules
+
+
+# Minute-of-day index
+class FeedingIndex:
+    # Every schedule of every pet in one of 1440 slots (minute of day):
+    #   slots[m]    - list of pets, once per schedule due at minute m
+    #   food[m]     - {food: [kg, count]} totals for minute m
+    #   occupied    - sorted minutes that have a schedule
+    # "due at", "food at" are one list lookup, the next feeding time is one
+    # bisect, and "due in the next hour" reads only the occupied slots in it.
+    # Slots hold pets, not Schedule objects, so the loader can fill the index
+    # without reading every pet's schedules into memory.
+    def __init__(self):
+        self.slots = [None] * DAY_MINUTES
+        self.food = [None] * DAY_MINUTES
+        self.occupied = []
+
+    def add(self, pet, schedule):
+        self.add_entry(pet, schedule.minute, schedule.food, schedule.amount)
+
+    def add_entry(self, pet, m, food, amount):
+        if m is None or not math.isfinite(amount): # a nan/inf amount would spoil the totals
+            return
+        if self.slots[m] is None:
+            self.slots[m] = []
+            self.food[m] = {}
+            insort(self.occupied, m)
+        self.slots[m].append(pet)
+        total = self.food[m].setdefault(food, [0.0, 0])
+        total[0] += amount
+        total[1] += 1
+
+    def remove(self, pet, schedule):
+        m = schedule.minute
+        if m is None or not math.isfinite(schedule.amount) or self.slots[m] is None or pet not in self.slots[m]:
+            return
+        slot = self.slots[m]
+        slot.remove(pet)
+        total = self.food[m][schedule.food]
+        total[0] -= schedule.amount
+        total[1] -= 1
+        if total[1] == 0:
+            del self.food[m][schedule.food]
+        if not slot:
+            self.slots[m] = None
+            self.food[m] = None
+            del self.occupied[bisect_left(self.occupied, m)]
+
+    def pets_at(self, minute): # pets with a schedule at this minute, each once
+        return list(dict.fromkeys(self.slots[minute] or []))
+
+    def due_at(self, minute): # [(pet, schedule)] due at this minute
+        return [(pet, s) for pet in self.pets_at(minute) for s in pet.schedules if s.minute == minute]
+
+    def food_at(self, minute): # {food: kg} due at this minute
+        return {food: total[0] for food, total in (self.food[minute] or {}).items()}
+
+    def due_within(self, minute, span=60): # [(minute, pet, schedule)] from minute for span minutes, past midnight too
+        found = []
+        end = minute + span
+        for start, stop in ((minute, min(end, DAY_MINUTES)), (0, end - DAY_MINUTES)):
+            lo = bisect_left(self.occupied, start)
+            hi = bisect_left(self.occupied, stop)
+            for m in self.occupied[lo:hi]:
+                found += [(m, pet, s) for pet, s in self.due_at(m)]
+        return found
+
+    def next_slot(self, minute): # first occupied minute at or after minute, wrapping to tomorrow
+        if not self.occupied:
+            return None
+        pos = bisect_left(self.occupied, minute)
+        return self.occupied[pos] if pos < len(self.occupied) else self.occupied[0]
+
+
+def due_message(index, minute, limit=10): # text for the feeding ticker
+    pets = index.pets_at(minute) # only the pets listed have their schedules read
+    lines = [f"{pet.name}: {s.food} {s.amount}kg"
+             for pet in pets[:limit] for s in pet.schedules if s.minute == minute]
+    if len(pets) > limit:
+        lines.append(f"... and {len(pets) - limit} more pets")
+    totals = ", ".join(f"{food} {kg:g}kg" for food, kg in index.food_at(minute).items())
+    return f"Feeding time {minute_to_time(minute)}\n\n" + "\n".join(lines) + f"\n\nTotal: {totals}"
+
+
+# Background writer
+class FeedingWriter:
+    # One daemon thread does every file write, so the Tk thread never waits
+    # on the disk. Jobs queued close together are merged: a snapshot makes the
+    # jobs before it pointless, and the appends after it become one write
+    # with one fsync.
+    def __init__(self, filename, log_name):
+        self.filename = filename
+        self.log_name = log_name
+        self.jobs = queue.Queue()
+        self.failed = False
+        self.thread = None
+
+    def submit(self, kind, lines): # kind is "append" (log) or "snapshot" (whole file)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.jobs.put((kind, lines))
+
+    def wait_idle(self): # block until everything queued is on disk
+        self.jobs.join()
+
+    def run(self):
+        while True:
+            batch = [self.jobs.get()]
+            while True: # take whatever else is already waiting
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+                self.failed = False
+            except OSError:
+                self.failed = True
+            for job in batch:
+                self.jobs.task_done()
+
+    def write(self, batch):
+        snapshot = None
+        appends = []
+        for kind, lines in batch:
+            if kind == "snapshot":
+                snapshot = lines
+                appends = [] # already in the snapshot
+            else:
+                appends.extend(lines)
+        if snapshot is not None:
+            tmp_name = self.filename + ".tmp"
+            with open(tmp_name, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in snapshot))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, self.filename) # atomic swap
+            open(self.log_name, "w").close() # log is in the snapshot now
+        if appends:
+            with open(self.log_name, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in appends))
+                f.flush()
+                os.fsync(f.fileno())
+
+
+# Data store
+class FeedingStore:
+    # All pets, shared by every page (see get_feeding). feeding_data.txt is a
+    # snapshot; after that only changed pets are written, each as a block
+    # appended to feeding_data.log:
+    #   PET|name|age|weight|pid, SCHEDULE|... lines, END|pid
+    #   DELPET|pid
+    # A block replaces the pet with that pid, so replaying the log again on a
+    # newer snapshot gives the same result. Blocks cut off by a crash have no
+    # END line and are ignored.
+    # Loading streams the snapshot once: each pet keeps the byte offset of its
+    # schedule lines and the lines go straight into the index, the Schedule
+    # objects are only made when a pet's schedules are asked for.
+    def __init__(self, filename=FEEDING_FILE):
+        self.filename = filename
+        self.log_name = os.path.splitext(filename)[0] + ".log"
+        self.pets = []
+        self.next_pid = 1
+        self.dirty = {} # pid -> pet changed since the last autosave
+        self.deleted = set() # pids deleted since the last autosave
+        self.log_blocks = 0
+        self.writer = FeedingWriter(self.filename, self.log_name)
+        self.on_dirty = None # called after every change, the page arms its autosave
+        self.index = FeedingIndex()
+
+        # called as listener(pet, old, new) after a schedule is added (old None)
+        # or deleted (new None), also for every schedule of a deleted pet
+        self.listeners = []
+
+    def load(self):
+        self.writer.wait_idle()
+        changes = self.replay() # the log is small, read it first
+        self.index = FeedingIndex()
+        self.next_pid = 1
+        by_pid = {}
+        try:
+            with open(self.filename, "rb") as f:
+                pet = None # pet whose schedule lines are being indexed
+                offset = 0
+                for raw in f: # one line at a time, not readlines()
+                    offset += len(raw)
+                    parts = raw.decode("utf-8").strip().split("|")
+                    if parts[0] == "PET":
+                        pet = self.read_pet(parts, by_pid)
+                        if pet.pid in changes: # the log has a newer copy, or deleted it
+                            by_pid[pet.pid] = changes.pop(pet.pid)
+                            self.index_pet(by_pid[pet.pid])
+                            pet = None
+                            continue
+                        pet.source, pet.offset = self.filename, offset
+                        pet._schedules = None
+                        by_pid[pet.pid] = pet
+                    elif parts[0] == "SCHEDULE" and pet and len(parts) >= 4:
+                        try:
+                            amount = float(parts[3])
+                        except ValueError:
+                            continue # parse_schedule skips it too
+                        self.index.add_entry(pet, time_to_minute(parts[1]), sys.intern(parts[2]), amount)
+        except FileNotFoundError:
+            pass  # first time no file
+        for pid, pet in changes.items(): # pets added since the snapshot
+            by_pid[pid] = pet
+            self.index_pet(pet)
+        self.pets[:] = [pet for pet in by_pid.values() if pet is not None]
+        self.next_pid = max(self.next_pid, max(by_pid, default=0) + 1, self.log_next_pid)
+        self.dirty.clear()
+        self.deleted.clear()
+        if self.log_blocks >= COMPACT_BLOCKS:
+            self.save_snapshot()
+
+    def read_pet(self, parts, by_pid): # PET line -> Pet, old lines have no pid
+        pid = int(parts[4]) if len(parts) > 4 and parts[4].isdigit() else 0
+        if pid == 0 or pid in by_pid:
+            pid = self.next_pid
+        self.next_pid = max(self.next_pid, pid + 1)
+        return Pet(parts[1], int(parts[2]), float(parts[3]), pid)
+
+    def index_pet(self, pet):
+        if pet is not None:
+            for s in pet.schedules:
+                self.index.add(pet, s)
+
+    def replay(self): # the log -> {pid: newest Pet, None if deleted}, in log order
+        # Whatever follows the last END/DELPET line is a block cut off by a
+        # crash: it is truncated so the next append starts on a clean line,
+        # and its pid is still counted as used
+        changes = {}
+        self.log_blocks = 0
+        self.log_next_pid = 1 # above every pid in the log, torn blocks too
+        try:
+            with open(self.log_name, "rb") as f:
+                pet = None
+                offset = good = 0 # good: end of the last complete block
+                for raw in f:
+                    offset += len(raw)
+                    if not raw.endswith(b"\n"):
+                        break
+                    parts = raw.decode("utf-8", "replace").strip().split("|")
+                    try:
+                        if parts[0] == "PET":
+                            self.log_next_pid = max(self.log_next_pid, int(parts[4]) + 1)
+                            pet = Pet(parts[1], int(parts[2]), float(parts[3]), int(parts[4]))
+                        elif parts[0] == "SCHEDULE" and pet:
+                            pet.schedules.append(Schedule(parts[1], parts[2], float(parts[3])))
+                        elif parts[0] == "END" and pet and int(parts[1]) == pet.pid:
+                            changes[pet.pid] = pet # replaces, or adds at the end
+                            self.log_blocks += 1
+                            pet = None
+                            good = offset
+                        elif parts[0] == "DELPET":
+                            changes[int(parts[1])] = None
+                            self.log_blocks += 1
+                            good = offset
+                    except (ValueError, IndexError):
+                        pet = None # torn line, drop the block
+                torn = good < f.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return changes
+        if torn:
+            with open(self.log_name, "r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return changes
+
+    # Changes, all go through here so they are tracked for the autosave
+    def add_pet(self, pet):
+        pet.pid = self.next_pid
+        self.next_pid += 1
+        self.pets.append(pet)
+        self.mark(pet)
+
+    def delete_pet(self, index):
+        pet = self.pets.pop(index)
+        self.dirty.pop(pet.pid, None)
+        self.deleted.add(pet.pid)
+        for s in pet.schedules:
+            self.index.remove(pet, s)
+            self.notify(pet, s, None)
+        self.changed()
+        return pet
+
+    def add_schedule(self, pet, schedule):
+        pet.add_schedule(schedule)
+        self.index.add(pet, schedule)
+        self.mark(pet)
+        self.notify(pet, None, schedule)
+
+    def delete_schedule(self, pet, index):
+        schedule = pet.schedules[index]
+        pet.remove_schedule(index)
+        self.index.remove(pet, schedule)
+        self.mark(pet)
+        self.notify(pet, schedule, None)
+
+    def notify(self, pet, old, new):
+        for listener in self.listeners:
+            listener(pet, old, new)
+
+    def mark(self, pet):
+        pet.dirty = True
+        self.dirty[pet.pid] = pet
+        self.changed()
+
+    def changed(self):
+        if self.on_dirty is not None:
+            self.on_dirty()
+
+    # Saving
+    def autosave(self): # queue the changed pets only
+        lines = [f"DELPET|{pid}" for pid in self.deleted]
+        for pet in self.dirty.values():
+            lines += pet.to_lines()
+            lines.append(f"END|{pet.pid}")
+            pet.dirty = False
+        self.deleted.clear()
+        self.dirty.clear()
+        if lines:
+            self.writer.submit("append", lines)
+
+    def save_snapshot(self): # queue the whole file, the log starts over
+        # to_lines reads the schedules of pets still on disk before the file
+        # is replaced, so no pet is left with an offset into the old file
+        lines = []
+        for pet in self.pets:
+            lines += pet.to_lines()
+            lines.append("")  # separate pets
+            pet.dirty = False
+        self.deleted.clear()
+        self.dirty.clear()
+        self.log_blocks = 0
+        self.writer.submit("snapshot", lines)
+
+    def flush(self): # write everything now and wait, used at exit
+        self.autosave()
+        self.writer.wait_idle()
+
+
+# One store per run, shared by every Feeding Tracker page and flushed at exit
+_feeding = None
+
+
+def get_feeding():
+    global _feeding
+    if _feeding is None:
+        _feeding = FeedingStore()
+        _feeding.load()
+        atexit.register(_feeding.flush)
+    return _feeding
 
 # GUI + event handling class
 class FeedingTrackerApp:
     def __init__(self, master):
-        self.pets = [] # Maintain a list of all pets in self.pets.
+        self.store = get_feeding()
+        self.pets = self.store.pets # Maintain a list of all pets in self.pets.
         self.master = master
         self.selected_pet_index = None # Track which pet is selected
+        self.autosave_job = None
         
         # Variables for inputs
         self.pet_name = tk.StringVar()
@@ -67,6 +516,11 @@ class FeedingTrackerApp:
 
         main_frame = tk.Frame(master)  
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.main_frame = main_frame
+
+        # changes are saved AUTOSAVE_DELAY_MS after the last one, and when the page closes
+        self.store.on_dirty = self.schedule_autosave
+        main_frame.bind("<Destroy>", self.on_destroy)
 
         # Top Add Pet
         frame_pet = tk.LabelFrame(main_frame, text="Pet entry")
@@ -128,6 +582,7 @@ class FeedingTrackerApp:
         frame_save = tk.Frame(main_frame)
         frame_save.pack(fill=tk.X, pady=5)
         tk.Button(frame_save, text="Save to File", command=self.save_to_file).pack(side=tk.RIGHT, padx=5)
+        tk.Button(frame_save, text="Food Forecast", command=self.show_forecast).pack(side=tk.LEFT, padx=5)
 
         # load saved data automatically
         self.load_from_file()
@@ -191,7 +646,7 @@ class FeedingTrackerApp:
             return
     
         pet = Pet(name, age, weight)
-        self.pets.append(pet)
+        self.store.add_pet(pet)
         
         # Update list
         self.refresh_pet_list()
@@ -229,11 +684,14 @@ class FeedingTrackerApp:
         except ValueError:
             messagebox.showwarning("Warning", "Amount is required and must be a number!")
             return
+        if not math.isfinite(amount) or amount <= 0:
+            messagebox.showwarning("Warning", "Amount must be a number above 0!")
+            return
 
         # Add to selected pet
         pet = self.pets[self.selected_pet_index]
         schedule = Schedule(time_str, food, amount)
-        pet.schedules.append(schedule)
+        self.store.add_schedule(pet, schedule)
         
         self.refresh_schedule_list(self.selected_pet_index)
         
@@ -253,7 +711,7 @@ class FeedingTrackerApp:
         name = self.pets[idx].name
         
         if messagebox.askyesno("Confirm", f"Delete {name}?"):
-            del self.pets[idx]
+            self.store.delete_pet(idx)
             self.refresh_pet_list()
             self.selected_pet_index = None
             self.list_schedules.delete(0, tk.END)
@@ -272,43 +730,88 @@ class FeedingTrackerApp:
         pet = self.pets[self.selected_pet_index]
         
         if messagebox.askyesno("Confirm", "Delete this schedule?"):
-            del pet.schedules[idx]
+            self.store.delete_schedule(pet, idx)
             self.refresh_schedule_list(self.selected_pet_index)
 
-    # Saves pets and their schedules to a text file.
-    def save_to_file(self): 
-        with open("feeding_data.txt", "w") as f:
-            for pet in self.pets:
-                f.write(f"PET|{pet.name}|{pet.age}|{pet.weight}\n")
-                for s in pet.schedules:
-                    f.write(f"SCHEDULE|{s.time_str}|{s.food}|{s.amount}\n")
-                f.write("\n")  # separate pets
-        messagebox.showinfo("Saved", "Data saved to feeding_data.txt")
-
-    # load file
-    def load_from_file(self):
-        self.pets.clear()
+    # autosave, restarted by every change so a burst of edits is one write
+    def schedule_autosave(self):
+        if self.autosave_job is not None:
+            self.main_frame.after_cancel(self.autosave_job)
+        self.autosave_job = self.main_frame.after(AUTOSAVE_DELAY_MS, self.autosave)
+
+    def autosave(self):
+        self.autosave_job = None
+        if self.store.writer.failed:
+            messagebox.showerror("Error", f"Failed to save data to {self.store.filename}.")
+        self.store.autosave() # only queues, the writer thread does the disk work
+
+    def on_destroy(self, event):
+        if event.widget is not self.main_frame:
+            return
+        if self.autosave_job is not None:
+            self.main_frame.after_cancel(self.autosave_job)
+        self.autosave_job = None
+        self.store.on_dirty = None
+        self.store.autosave()
+
+    # Daily/weekly food use and when each food runs out (optional NumPy engine)
+    def show_forecast(self):
         try:
-            with open("feeding_data.txt", "r") as f:
-                lines = f.readlines()
-
-            pet = None
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                parts = line.split("|")
-                if parts[0] == "PET":
-                    name, age, weight = parts[1], int(parts[2]), float(parts[3])
-                    pet = Pet(name, age, weight)
-                    self.pets.append(pet)
-                
-                elif parts[0] == "SCHEDULE" and pet:
-                    time_str, food, amount = parts[1], parts[2], float(parts[3])
-                    pet.schedules.append(Schedule(time_str, food, amount))
+            import Feeding_Forecast
+        except ImportError:
+            messagebox.showerror("Error", "Food forecast needs NumPy.\nInstall it with: pip install numpy")
+            return
+        forecast = Feeding_Forecast.get_forecast()
+
+        win = tk.Toplevel(self.master)
+        win.title("Food Forecast")
+        tk.Label(win, text="All pets, by food", font=("Arial", 12, "bold")).pack(pady=5)
+        lst = tk.Listbox(win, width=60, height=20)
+        lst.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def refresh():
+            lst.delete(0, tk.END)
+            for line in Feeding_Forecast.format_forecast(forecast.report()):
+                lst.insert(tk.END, line)
+
+        # stock counted today for one food
+        form = tk.Frame(win)
+        form.pack(pady=5)
+        food_var, stock_var = tk.StringVar(), tk.StringVar()
+        tk.Label(form, text="Food:").grid(row=0, column=0, sticky="e", padx=5)
+        tk.Entry(form, textvariable=food_var, width=15).grid(row=0, column=1)
+        tk.Label(form, text="Stock (kg):").grid(row=0, column=2, sticky="e", padx=5)
+        tk.Entry(form, textvariable=stock_var, width=10).grid(row=0, column=3)
+
+        def set_stock():
+            food = food_var.get().strip()
+            try:
+                kg = float(stock_var.get().strip())
+                if not math.isfinite(kg) or kg < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Stock must be a non-negative number.")
+                return
+            if not food:
+                messagebox.showerror("Error", "Food is required.")
+                return
+            forecast.set_stock(food, kg)
+            refresh()
 
-            self.refresh_pet_list()
-        
-        except FileNotFoundError:
-            pass  # first time no file
\ No newline at end of file
+        tk.Button(form, text="Set Stock", bg="#1dbc5f", fg="white", command=set_stock).grid(row=0, column=4, padx=10)
+        tk.Button(win, text="Close", command=win.destroy).pack(pady=5)
+        refresh()
+
+    # Saves pets and their schedules to a text file, the whole file at once
+    def save_to_file(self): 
+        self.store.save_snapshot()
+        self.store.writer.wait_idle() # the user asked for it, report what really happened
+        if self.store.writer.failed:
+            messagebox.showerror("Error", f"Failed to save data to {self.store.filename}.")
+            return
+        messagebox.showinfo("Saved", f"Data saved to {self.store.filename}")
+
+    # load file (the store loads it once per run)
+    def load_from_file(self):
+        self.pets = self.store.pets
+        self.refresh_pet_list()
\ No newline at end of file
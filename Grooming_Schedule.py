@@ -1,19 +1,585 @@
+import atexit
+import os
 import tkinter as tk
 from tkinter import messagebox
-from datetime import datetime 
+from array import array
+from bisect import bisect_left, insort
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+
+GROOMING_FILE = "grooming_data.txt"
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+RULE_MARK = "@R" #recurring task lines: "@R|pet|start|repeat|until|skips|task"
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+REPEAT_KINDS = {"None": None, "Every N days": "days", "Weekly on": "weekly", "Every N months": "monthly"}
+UPCOMING_DAYS = 14 #how far the "Next 14 days" view expands repeating tasks
+DEAD = -(1 << 63) #minutes value of a deleted row
+GEN_MARK = "@G" #first line of the snapshot and the log: "@G|generation"
+FLUSH_DELAY_MS = 500 #changes made within this time are written together
+SNAPSHOT_OPS = 500 #rewrite the snapshot once the log has this many changes
+DEAD_MARK = "@D" #snapshot line for a deleted row, so row numbers still match the log
+VIEWS = {"All": "all", "By date": "sorted", "Next due per pet": "next", "Overdue": "overdue",
+         "Today": "today", f"Next {UPCOMING_DAYS} days": "upcoming"}
+
+
+#one grooming task, when is a datetime (or the raw text if the file had a bad date)
+class GroomingTask:
+    __slots__ = ("pet", "when", "task")
+
+    def __init__(self, pet, when, task):
+        self.pet = pet
+        self.when = when
+        self.task = task
+
+    def date_text(self):
+        if isinstance(self.when, datetime):
+            return self.when.strftime(DATE_FORMAT)
+        return self.when
+
+    def to_line(self): #the file format "pet|date|task"
+        return f"{self.pet}|{self.date_text()}|{self.task}"
+
+    def next_after(self, moment): #its time if still to come (same call as GroomingRule)
+        if isinstance(self.when, datetime) and self.when >= moment:
+            return self.when
+        return None
+
+    #same pet, time and task count as the same task (reminders)
+    def __eq__(self, other):
+        return (isinstance(other, GroomingTask) and self.pet == other.pet
+                and self.when == other.when and self.task == other.task)
+
+    def __hash__(self):
+        return hash((self.pet, self.when, self.task))
+
+
+#"YYYY-MM-DD HH:MM" -> minutes since 0001-01-01, or None
+#the day part is cached since many tasks share a day
+_day_cache = {}
+
+
+def parse_minute(text):
+    if len(text) != 16 or text[4] != "-" or text[7] != "-" or text[10] != " " or text[13] != ":":
+        return None
+    day = _day_cache.get(text[:10])
+    try:
+        if day is None:
+            day = date(int(text[:4]), int(text[5:7]), int(text[8:10])).toordinal()
+            _day_cache[text[:10]] = day
+        hour = int(text[11:13])
+        minute = int(text[14:16])
+    except ValueError:
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return day * 1440 + hour * 60 + minute
+
+
+def to_minute(when):
+    return when.toordinal() * 1440 + when.hour * 60 + when.minute
+
+
+def from_minute(stamp):
+    return datetime.fromordinal(stamp // 1440) + timedelta(minutes=stamp % 1440)
+
+
+class GroomingTable:
+    #All tasks in three parallel arrays, 16 bytes a task:
+    #  minutes - time as minutes since 0001-01-01, or -1-k for a bad date text names[k]
+    #  pets    - index into names
+    #  tasks   - index into names
+    #Each pet/task text is kept once in names. GroomingTask objects are only
+    #made when a row is read, so the file is split and parsed once on load.
+    #A deleted row keeps its place with minutes = DEAD, so row numbers never
+    #move and the date index below can point at them.
+    def __init__(self):
+        self.minutes = array("q")
+        self.pets = array("i")
+        self.tasks = array("i")
+        self.names = []
+        self.codes = {} #text -> index in names
+        self.live = 0 #rows not deleted
+
+        #Date index: (minute, row) sorted, for all tasks and per pet code,
+        #kept current on add/update/delete. Bad-date rows are in undated.
+        self.by_time = []
+        self.by_pet = {}
+        self.undated = set()
+
+    def code(self, text):
+        code = self.codes.get(text)
+        if code is None:
+            code = len(self.names)
+            self.names.append(text)
+            self.codes[text] = code
+        return code
+
+    def encode(self, task):
+        if isinstance(task.when, datetime):
+            stamp = to_minute(task.when)
+        else:
+            stamp = -1 - self.code(task.when)
+        return stamp, self.code(task.pet), self.code(task.task)
+
+    def __len__(self):
+        return self.live
+
+    def __getitem__(self, i):
+        stamp = self.minutes[i]
+        when = from_minute(stamp) if stamp >= 0 else self.names[-1 - stamp]
+        return GroomingTask(self.names[self.pets[i]], when, self.names[self.tasks[i]])
+
+    def __iter__(self):
+        for i in self.live_rows():
+            yield self[i]
+
+    def add_dead(self): #a deleted row read back from a snapshot, keeps the numbering
+        self.minutes.append(DEAD)
+        self.pets.append(0)
+        self.tasks.append(0)
+
+    def live_rows(self): #row numbers not deleted, in the order added
+        return [i for i, stamp in enumerate(self.minutes) if stamp != DEAD]
+
+    def append(self, task): #returns the new row number
+        stamp, pet, name = self.encode(task)
+        self.minutes.append(stamp)
+        self.pets.append(pet)
+        self.tasks.append(name)
+        self.live += 1
+        self.index_add(len(self.minutes) - 1)
+        return len(self.minutes) - 1
+
+    def __setitem__(self, i, task):
+        self.index_remove(i)
+        self.minutes[i], self.pets[i], self.tasks[i] = self.encode(task)
+        self.index_add(i)
+
+    def remove(self, i): #delete a row, returns its task
+        task = self[i]
+        self.index_remove(i)
+        self.minutes[i] = DEAD
+        self.live -= 1
+        return task
+
+    # -------------------------
+    #        DATE INDEX
+    # -------------------------
+
+    def index_add(self, i):
+        stamp = self.minutes[i]
+        if stamp < 0:
+            self.undated.add(i)
+            return
+        insort(self.by_time, (stamp, i))
+        insort(self.by_pet.setdefault(self.pets[i], []), (stamp, i))
+
+    def index_remove(self, i):
+        stamp = self.minutes[i]
+        if stamp < 0:
+            self.undated.discard(i)
+            return
+        remove_sorted(self.by_time, (stamp, i))
+        entries = self.by_pet[self.pets[i]]
+        remove_sorted(entries, (stamp, i))
+        if not entries:
+            del self.by_pet[self.pets[i]]
+
+    def build_index(self): #one sort after a bulk load instead of an insort per row
+        self.by_time = sorted((stamp, i) for i, stamp in enumerate(self.minutes) if stamp >= 0)
+        self.by_pet = {}
+        for key in self.by_time: #already in date order, so every pet list is too
+            self.by_pet.setdefault(self.pets[key[1]], []).append(key)
+        self.undated = {i for i, stamp in enumerate(self.minutes) if DEAD < stamp < 0}
+
+    def add_line(self, line): #parse one "pet|date|task" line straight into the arrays
+        parts = line.split("|", 2)
+        date_text = parts[1].strip()
+        stamp = parse_minute(date_text)
+        if stamp is None:
+            stamp = -1 - self.code(date_text)
+        self.minutes.append(stamp)
+        self.pets.append(self.code(parts[0].strip()))
+        self.tasks.append(self.code(parts[2].strip()))
+        self.live += 1 #not indexed yet, load_grooming calls build_index
+
+    def by_date(self): #row numbers in date order, bad dates last
+        return [key[1] for key in self.by_time] + sorted(self.undated)
+
+    def rows_between(self, start, end): #row numbers with start <= time < end, by date
+        lo = bisect_left(self.by_time, (to_minute(start), -1))
+        hi = bisect_left(self.by_time, (to_minute(end), -1))
+        return [key[1] for key in self.by_time[lo:hi]]
+
+    def overdue(self, now): #rows before now, by date
+        return [key[1] for key in self.by_time[:bisect_left(self.by_time, (to_minute(now), -1))]]
+
+    def next_per_pet(self, now): #first row at or after now for every pet -> {pet: row}
+        stamp = to_minute(now)
+        found = {}
+        for code, entries in self.by_pet.items():
+            pos = bisect_left(entries, (stamp, -1))
+            if pos < len(entries):
+                found[self.names[code]] = entries[pos][1]
+        return found
+
+
+def remove_sorted(entries, key): #remove key from a sorted list
+    pos = bisect_left(entries, key)
+    if pos < len(entries) and entries[pos] == key:
+        del entries[pos]
+
+
+class GroomingRule:
+    #One repeating task, stored as one line however often it repeats:
+    #  kind  - "days" (every step days), "weekly" (on the weekday numbers
+    #          in step) or "monthly" (every step months, same day of month)
+    #  until - last date or None, skips - date ordinals left out
+    #Occurrences are never stored, occurrences() works them out for a window.
+    __slots__ = ("pet", "start", "task", "kind", "step", "until", "skips")
+
+    def __init__(self, pet, start, task, kind, step, until=None, skips=frozenset()):
+        self.pet = pet
+        self.start = start
+        self.task = task
+        self.kind = kind
+        self.step = step
+        self.until = until
+        self.skips = skips
+
+    def date_text(self):
+        return self.start.strftime(DATE_FORMAT)
+
+    def repeat_param(self): #the form text for step: "3", "Mon,Wed"
+        if self.kind == "weekly":
+            return ",".join(WEEKDAYS[day] for day in self.step)
+        return str(self.step)
+
+    def describe(self):
+        if self.kind == "days":
+            text = "every day" if self.step == 1 else f"every {self.step} days"
+        elif self.kind == "weekly":
+            text = "weekly on " + ", ".join(WEEKDAYS[day] for day in self.step)
+        else:
+            text = "every month" if self.step == 1 else f"every {self.step} months"
+        if self.until is not None:
+            text += f" until {self.until.isoformat()}"
+        return text
+
+    def to_line(self):
+        until = self.until.isoformat() if self.until is not None else ""
+        skips = ",".join(date.fromordinal(day).isoformat() for day in sorted(self.skips))
+        return f"{RULE_MARK}|{self.pet}|{self.date_text()}|{self.kind}:{self.repeat_param()}|{until}|{skips}|{self.task}"
+
+    def key(self):
+        return (self.pet, self.start, self.task, self.kind, self.step, self.until, self.skips)
+
+    def __eq__(self, other):
+        return isinstance(other, GroomingRule) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def with_skip(self, day): #a copy with one more skipped date
+        return GroomingRule(self.pet, self.start, self.task, self.kind, self.step,
+                            self.until, self.skips | {day.toordinal()})
+
+    def with_skips(self, skips): #a copy also skipping those date ordinals that are still occurrences
+        kept = set(self.skips)
+        for day in skips:
+            start = datetime.combine(date.fromordinal(day), time())
+            if next(self.occurrences(start, start + timedelta(days=1)), None) is not None:
+                kept.add(day)
+        return GroomingRule(self.pet, self.start, self.task, self.kind, self.step,
+                            self.until, frozenset(kept))
+
+    def occurrences(self, start, end):
+        #lazily yield every occurrence time with start <= time < end
+        if self.until is not None:
+            end = min(end, datetime.combine(self.until, time()) + timedelta(days=1))
+        first = max(start, self.start)
+        if self.kind == "days":
+            span = timedelta(days=self.step)
+            when = self.start + -((self.start - first) // span) * span #first one at or after `first`
+            while when < end:
+                if when.toordinal() not in self.skips:
+                    yield when
+                when += span
+        elif self.kind == "weekly":
+            when = datetime.combine(first.date(), self.start.time())
+            if when < first:
+                when += timedelta(days=1)
+            while when < end:
+                if when.weekday() in self.step and when.toordinal() not in self.skips:
+                    yield when
+                when += timedelta(days=1)
+        else:
+            base = self.start.year * 12 + self.start.month - 1
+            count = max(0, (first.year * 12 + first.month - 1 - base) // self.step)
+            while True:
+                year, month = divmod(base + count * self.step, 12)
+                day = min(self.start.day, monthrange(year, month + 1)[1]) #31st -> last day of short months
+                when = datetime(year, month + 1, day, self.start.hour, self.start.minute)
+                if when >= end:
+                    return
+                if when >= first and when.toordinal() not in self.skips:
+                    yield when
+                count += 1
+
+    def next_after(self, moment):
+        return next(self.occurrences(moment, datetime.max), None)
+
+
+def parse_repeat(kind, param):
+    #form/file text -> step for a kind, raises ValueError
+    param = param.strip()
+    if kind == "weekly":
+        names = [WEEKDAYS.index(name.strip().title()[:3]) for name in param.split(",") if name.strip()]
+        if not names: #"" or only commas, would never occur
+            raise ValueError("Enter weekdays, for example Mon,Thu.")
+        return tuple(sorted(set(names)))
+    if kind == "monthly" and param == "":
+        return 1
+    step = int(param)
+    if step < 1:
+        raise ValueError("Repeat count must be 1 or more.")
+    return step
+
+
+def parse_rule(line): #"@R|..." line -> GroomingRule, or None if it is broken
+    parts = [part.strip() for part in line.split("|", 6)]
+    if len(parts) != 7:
+        return None
+    marker, pet, start, repeat, until, skips, task = parts
+    kind, _, param = repeat.partition(":")
+    if kind not in ("days", "weekly", "monthly"):
+        return None
+    try:
+        return GroomingRule(
+            pet, datetime.strptime(start, DATE_FORMAT), task, kind, parse_repeat(kind, param),
+            date.fromisoformat(until) if until else None,
+            frozenset(date.fromisoformat(day).toordinal() for day in skips.split(",") if day))
+    except ValueError:
+        return None
+
+
+def parse_task(line): #"pet|date|task" -> GroomingTask
+    parts = [part.strip() for part in line.split("|", 2)]
+    stamp = parse_minute(parts[1])
+    return GroomingTask(parts[0], from_minute(stamp) if stamp is not None else parts[1], parts[2])
+
+
+def parse_item(line): #a file line -> GroomingRule or GroomingTask
+    rule = parse_rule(line) if line.startswith(RULE_MARK + "|") else None
+    return rule if rule is not None else parse_task(line)
+
+
+class GroomingLog:
+    #grooming_data.txt is a snapshot, every change since is one line appended
+    #to grooming_data.log:
+    #  A|<line>        add a task or repeating task
+    #  U|row|<line>    replace task row       RU|i|<line>  replace rule i
+    #  D|row           delete task row        RD|i         delete rule i
+    #Rows are GroomingTable row numbers, which match the snapshot order after
+    #a load. Both files start with "@G|n"; the log is only replayed when its
+    #n matches the snapshot, so a log left over from before a snapshot is ignored.
+    def __init__(self, filename=GROOMING_FILE):
+        self.filename = filename
+        self.log_name = os.path.splitext(filename)[0] + ".log"
+        self.generation = 0
+        self.ops = 0 #changes in the log
+        self.fresh = True #log must be started over with the header
+        self.pending = [] #lines not written yet
+
+        #the loaded data, see get_grooming
+        self.table = GroomingTable()
+        self.rules = []
+
+        #called as listener(old, new) after every add/update/delete of a task
+        #or rule, old is None for an add and new is None for a delete
+        self.listeners = []
+
+    def load(self): #-> (GroomingTable, list of GroomingRule)
+        table, rules = self.read()
+        if self.ops >= SNAPSHOT_OPS or self.dead_marks:
+            self.snapshot(table, rules, keep_rows=False) #nothing holds row numbers yet
+            table, rules = self.read()
+        self.table, self.rules = table, rules
+        return table, rules
+
+    def notify(self, old, new):
+        for listener in self.listeners:
+            listener(old, new)
+
+    def read(self):
+        table = GroomingTable()
+        rules = []
+        self.generation = 0
+        self.dead_marks = 0 #DEAD_MARK lines, dropped by the next load's snapshot
+        try:
+            with open(self.filename, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        rule = parse_rule(line) if line.startswith(RULE_MARK + "|") else None
+                        if rule is not None:
+                            rules.append(rule)
+                        elif line == DEAD_MARK:
+                            table.add_dead()
+                            self.dead_marks += 1
+                        elif line.startswith(GEN_MARK + "|") and line[3:].isdigit():
+                            self.generation = int(line[3:])
+                        # basic format check: must have 2 | at least
+                        elif line.count("|") >= 2: 
+                            table.add_line(line) #add the content to the table
+        except FileNotFoundError:
+            pass
+        table.build_index()
+        self.replay(table, rules)
+        return table, rules
+
+    def replay(self, table, rules):
+        #a torn last line after a crash (no newline, or not parsable) and
+        #anything after it is not trusted, and is cut off so the next flush
+        #does not append onto it
+        self.ops = 0
+        self.fresh = True
+        try:
+            with open(self.log_name, "rb") as f:
+                header = f.readline()
+                if not header.endswith(b"\n") or header.strip() != f"{GEN_MARK}|{self.generation}".encode():
+                    return #missing, torn or older than the snapshot
+                self.fresh = False
+                good = len(header) #end of the last trusted line
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        op, _, rest = raw.decode("utf-8").rstrip("\r\n").partition("|")
+                        if op == "A":
+                            item = parse_item(rest)
+                            if isinstance(item, GroomingRule):
+                                rules.append(item)
+                            else:
+                                table.append(item)
+                        elif op == "U":
+                            row, _, rest = rest.partition("|")
+                            table[int(row)] = parse_task(rest)
+                        elif op == "D":
+                            table.remove(int(rest))
+                        elif op == "RU":
+                            i, _, rest = rest.partition("|")
+                            rule = parse_rule(rest)
+                            if rule is None:
+                                break
+                            rules[int(i)] = rule
+                        elif op == "RD":
+                            rules.pop(int(rest))
+                        else:
+                            break
+                    except (ValueError, IndexError, KeyError):
+                        break
+                    good += len(raw)
+                    self.ops += 1
+                torn = good < f.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return
+        if torn:
+            with open(self.log_name, "r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def flush(self): #write pending lines with one append and one fsync
+        if not self.pending:
+            return
+        mode = "a"
+        lines = self.pending
+        if self.fresh:
+            mode = "w"
+            lines = [f"{GEN_MARK}|{self.generation}"] + lines
+        with open(self.log_name, mode, encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.ops += len(self.pending)
+        self.pending = []
+        self.fresh = False
+        if self.ops >= SNAPSHOT_OPS: #fold the log in during a long session too
+            try:
+                self.snapshot(self.table, self.rules)
+            except OSError:
+                pass #the log is complete, try again after the next change
+
+    def snapshot(self, table, rules, keep_rows=True):
+        #write every task to a temp file and swap it in, then start a new log.
+        #keep_rows writes deleted rows as DEAD_MARK so the row numbers in use
+        #(and in later log lines) still match the file.
+        tmp_name = self.filename + ".tmp"
+        with open(tmp_name, "w") as f:
+            f.write(f"{GEN_MARK}|{self.generation + 1}\n")
+            for i, stamp in enumerate(table.minutes):
+                if stamp != DEAD:
+                    f.write(table[i].to_line() + "\n")
+                elif keep_rows:
+                    f.write(DEAD_MARK + "\n")
+            for rule in rules:
+                f.write(rule.to_line() + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, self.filename) #atomic, the old snapshot stays valid until here
+        self.generation += 1
+        self.fresh = True #until the new log header is written
+        with open(self.log_name, "w") as f:
+            f.write(f"{GEN_MARK}|{self.generation}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.ops = 0
+        self.fresh = False
+
+
+#read the grooming file and replay its log -> (GroomingTable, list of GroomingRule)
+def load_grooming(filename=GROOMING_FILE):
+    return GroomingLog(filename).load()
+
+
+#One loaded copy per file and run, shared by the grooming page, reminders and
+#calendar so they see the same tasks; pending log lines are flushed at exit
+_groomings = {}
+
+
+def get_grooming(filename=GROOMING_FILE):
+    grooming = _groomings.get(filename)
+    if grooming is None:
+        grooming = GroomingLog(filename)
+        grooming.load()
+        _groomings[filename] = grooming
+        atexit.register(grooming.flush)
+    return grooming
+
 
 class GroomingApp:
     
-    def __init__(self, parent_frame, filename="grooming_data.txt"):
+    def __init__(self, parent_frame, filename=GROOMING_FILE):
         self.parent = parent_frame
         self.filename = filename
 
-        #store raw lines "pet|date|task"
-        self.schedules = []
+        #parsed tasks, see GroomingTable, and repeating tasks
+        self.schedules = GroomingTable()
+        self.rules = []
+
+        #shared data and log, changes are written together after FLUSH_DELAY_MS
+        self.log = get_grooming(self.filename)
+        self.flush_job = None
+
+        #what each listbox line is: ("task", row), ("rule", index) or
+        #("occ", rule index, time) for one occurrence of a repeating task
+        self.rows = []
 
         #Main frame for the module 
         self.frame = tk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
+        self.frame.bind("<Destroy>", self.on_destroy) #page switch or window closed
 
         #Form area to get user input
         form = tk.Frame(self.frame)
@@ -31,6 +597,20 @@ class GroomingApp:
         self.task_entry = tk.Entry(form, width=40)
         self.task_entry.grid(row=2, column=1, sticky="w", pady=6)
 
+        #Repeat: kind + "3" (days/months) or "Mon,Thu" (weekdays)
+        tk.Label(form, text="Repeat:", anchor="w").grid(row=3, column=0, sticky="w", pady=6)
+        repeat_row = tk.Frame(form)
+        repeat_row.grid(row=3, column=1, sticky="w", pady=6)
+        self.repeat_var = tk.StringVar(value="None")
+        tk.OptionMenu(repeat_row, self.repeat_var, *REPEAT_KINDS).pack(side="left")
+        self.repeat_entry = tk.Entry(repeat_row, width=14)
+        self.repeat_entry.pack(side="left", padx=5)
+        tk.Label(repeat_row, text="(3 or Mon,Thu)").pack(side="left")
+
+        tk.Label(form, text="Repeat until (YYYY-MM-DD):", anchor="w").grid(row=4, column=0, sticky="w", pady=6)
+        self.until_entry = tk.Entry(form, width=40)
+        self.until_entry.grid(row=4, column=1, sticky="w", pady=6)
+
         #Buttons
         btns = tk.Frame(self.frame)
         btns.pack(padx=20, pady=8, fill="x")
@@ -41,6 +621,14 @@ class GroomingApp:
         tk.Button(btns, text="Clear", width=10, command=self.clear_form).pack(side="left", padx=5)
         tk.Button(btns, text="Refresh", width=10, command=self.refresh_list).pack(side="left", padx=5)
 
+        #View: every schedule, by date, what's next, or the next days with repeats expanded
+        views = tk.Frame(self.frame)
+        views.pack(padx=20, fill="x")
+        tk.Label(views, text="Show:").pack(side="left")
+        self.view_label = tk.StringVar(value="All")
+        tk.OptionMenu(views, self.view_label, *VIEWS, command=lambda label: self.refresh_list()).pack(side="left")
+        tk.Button(views, text="Skip Occurrence", width=16, command=self.skip_occurrence).pack(side="right", padx=5)
+
         #List area
         list_area = tk.Frame(self.frame)
         list_area.pack(padx=20, pady=10, fill="both", expand=True)
@@ -53,6 +641,7 @@ class GroomingApp:
         scrollbar = tk.Scrollbar(list_area, command=self.listbox.yview)
         scrollbar.pack(side="right", fill="y", pady=6)
         self.listbox.config(yscrollcommand=scrollbar.set)
+        self.listbox.bind("<<ListboxSelect>>", self.load_selected)
 
         
 
@@ -64,44 +653,78 @@ class GroomingApp:
     #File
 
     def load_from_file(self):
-        self.schedules = []
+        self.schedules, self.rules = self.log.table, self.log.rules
+
+    def save_change(self, line): #queue one log line, written by flush
+        self.log.pending.append(line)
+        if self.flush_job is None:
+            self.flush_job = self.frame.after(FLUSH_DELAY_MS, self.flush)
+
+    def flush(self):
+        self.flush_job = None
         try:
-            with open(self.filename, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        # basic format check: must have 2 | at least
-                        if line.count("|") >= 2: 
-                            self.schedules.append(line) #add the content to schedules
-        except FileNotFoundError:
-            self.schedules = []
+            self.log.flush()
+        except OSError:
+            messagebox.showerror("Error", "Failed to save data to file.")
 
-    def save_to_file(self):
-        with open(self.filename, "w") as f:
-            for row in self.schedules:
-                f.write(row + "\n") 
+    def on_destroy(self, event):
+        if event.widget is not self.frame:
+            return
+        if self.flush_job is not None:
+            self.frame.after_cancel(self.flush_job)
+        self.flush()
 
     #Helpers
-    #assign all the value
-    def safe_split(self, row):
-        parts = row.split("|", 2) #split the value by using the |
-        if len(parts) != 3: #if the splitted velue not equal to 3
-            return "", "", row  #return "" to avoid crash
-        pet = parts[0].strip()
-        date = parts[1].strip() 
-        task = parts[2].strip()
-        return pet, date, task
+    def notify(self, old_task, new_task): #tell the reminders, calendar, ...
+        self.log.notify(old_task, new_task)
 
     def get_selected_index(self):  #check if the user select the listbox
         sel = self.listbox.curselection()
         if not sel:
             return None
         return sel[0]
+
+    def get_selected_row(self): #the rows entry of the selection, or None
+        idx = self.get_selected_index()
+        if idx is None or idx >= len(self.rows):
+            return None
+        return self.rows[idx]
+
+    def row_item(self, row): #the task or rule behind a listbox line
+        if row[0] == "task":
+            return self.schedules[row[1]]
+        return self.rules[row[1]]
+
+    def load_selected(self, event=None): #click on a line -> fill the form
+        row = self.get_selected_row()
+        if row is None:
+            return
+        item = self.row_item(row)
+        self.pet_entry.delete(0, tk.END)
+        self.pet_entry.insert(0, item.pet)
+        self.date_entry.delete(0, tk.END)
+        self.date_entry.insert(0, item.date_text())
+        self.task_entry.delete(0, tk.END)
+        self.task_entry.insert(0, item.task)
+        self.repeat_entry.delete(0, tk.END)
+        self.until_entry.delete(0, tk.END)
+        if row[0] == "task":
+            self.repeat_var.set("None")
+            return
+        for label, kind in REPEAT_KINDS.items():
+            if kind == item.kind:
+                self.repeat_var.set(label)
+        self.repeat_entry.insert(0, item.repeat_param())
+        if item.until is not None:
+            self.until_entry.insert(0, item.until.isoformat())
         
         #clear the content in the entry box
     def clear_form(self):
         self.pet_entry.delete(0, tk.END)
         self.task_entry.delete(0, tk.END)
+        self.repeat_var.set("None")
+        self.repeat_entry.delete(0, tk.END)
+        self.until_entry.delete(0, tk.END)
         self.listbox.selection_clear(0, tk.END)
         
         #set default Date/Time
@@ -111,9 +734,53 @@ class GroomingApp:
           
     def refresh_list(self):   
         self.listbox.delete(0, tk.END) #delete all content from listbox
-        for i, row in enumerate(self.schedules, start=1): #start from 1, insert all value("include new one")
-            pet, date, task = self.safe_split(row)
-            self.listbox.insert(tk.END, f"{i}. {date} | {pet} | {task}")
+        view = self.view()
+        if view == "all":
+            self.rows = [("task", i) for i in self.schedules.live_rows()]
+            self.rows += [("rule", i) for i in range(len(self.rules))]
+        elif view == "sorted":
+            self.rows = [("task", i) for i in self.schedules.by_date()]
+            self.rows += [("rule", i) for i in range(len(self.rules))]
+        elif view == "next":
+            self.rows = self.next_due_rows()
+        elif view == "overdue":
+            self.rows = [("task", i) for i in self.schedules.overdue(datetime.now())]
+        elif view == "today":
+            start = datetime.combine(date.today(), time())
+            self.rows = self.window_rows(start, start + timedelta(days=1))
+        else:
+            start = datetime.combine(date.today(), time())
+            self.rows = self.window_rows(start, start + timedelta(days=UPCOMING_DAYS))
+        for n, row in enumerate(self.rows, start=1): #start from 1, insert all value("include new one")
+            item = self.row_item(row)
+            if row[0] == "task":
+                line = f"{n}. {item.date_text()} | {item.pet} | {item.task}"
+            elif row[0] == "rule":
+                line = f"{n}. {item.date_text()} | {item.pet} | {item.task} | {item.describe()}"
+            else:
+                line = f"{n}. {row[2].strftime(DATE_FORMAT)} | {item.pet} | {item.task} (repeats)"
+            self.listbox.insert(tk.END, line)
+
+    def view(self):
+        return VIEWS[self.view_label.get()]
+
+    def window_rows(self, start, end): #tasks and repeat occurrences in start..end, by time
+        found = [(self.schedules[i].when, ("task", i)) for i in self.schedules.rows_between(start, end)]
+        for r, rule in enumerate(self.rules):
+            found += [(when, ("occ", r, when)) for when in rule.occurrences(start, end)]
+        found.sort(key=lambda pair: pair[0])
+        return [row for when, row in found]
+
+    def next_due_rows(self): #the next task or occurrence for every pet, soonest first
+        now = datetime.now()
+        best = {} #pet -> (time, row)
+        for pet, i in self.schedules.next_per_pet(now).items():
+            best[pet] = (self.schedules[i].when, ("task", i))
+        for r, rule in enumerate(self.rules):
+            when = rule.next_after(now)
+            if when is not None and (rule.pet not in best or when < best[rule.pet][0]):
+                best[rule.pet] = (when, ("occ", r, when))
+        return [row for when, row in sorted(best.values(), key=lambda pair: pair[0])]
 
     
     # validation pet name and task
@@ -144,77 +811,150 @@ class GroomingApp:
                 messagebox.showerror("Invalid Date", "Year must be between 2025 and 2035.")
                 return None
                 
-            return date_text # Return valid string
+            return valid_dt # Return the parsed datetime
             
         except ValueError:
             messagebox.showerror("Invalid Format", "Please enter format: YYYY-MM-DD HH:MM\nExample: 2025-05-20 13:14")
             return None
 
-    #Create,Read,Update,Delete function
-
-    def add_schedule(self):
-        pet_raw = self.pet_entry.get()
-        date_raw = self.date_entry.get()
-        task_raw = self.task_entry.get()
+    #validate the repeat fields -> (kind, step, until), None on error
+    def validate_repeat(self, when):
+        kind = REPEAT_KINDS[self.repeat_var.get()]
+        if kind is None:
+            return None, None, None
+        try:
+            step = parse_repeat(kind, self.repeat_entry.get())
+        except ValueError as err:
+            messagebox.showerror("Invalid Repeat", f"{err}\nUse a number for days/months or weekdays like Mon,Thu.")
+            return None
+        until_text = self.until_entry.get().strip()
+        until = None
+        if until_text:
+            try:
+                until = date.fromisoformat(until_text)
+            except ValueError:
+                messagebox.showerror("Invalid Date", "Repeat until must be YYYY-MM-DD.")
+                return None
+            if until < when.date():
+                messagebox.showerror("Invalid Date", "Repeat until must not be before the first date.")
+                return None
+        return kind, step, until
 
-        validated = self.validate_pet_task(pet_raw, task_raw)
+    #form -> GroomingTask, or GroomingRule if Repeat is set; None if invalid
+    def read_form(self):
+        validated = self.validate_pet_task(self.pet_entry.get(), self.task_entry.get())
         if validated is None:
-            return
+            return None
         pet, task = validated
 
         #check date and time
-        clean_date = self.validate_datetime(date_raw)
-        if clean_date is None:
-            return  
+        when = self.validate_datetime(self.date_entry.get())
+        if when is None:
+            return None
+
+        repeat = self.validate_repeat(when)
+        if repeat is None:
+            return None
+        kind, step, until = repeat
+        if kind is None:
+            return GroomingTask(pet, when, task)
+        return GroomingRule(pet, when, task, kind, step, until)
 
-        row = f"{pet}|{clean_date}|{task}"
-        self.schedules.append(row)
-        self.save_to_file()
+    #Create,Read,Update,Delete function
+
+    def put_item(self, item): #add a task or rule
+        if isinstance(item, GroomingRule):
+            self.rules.append(item)
+        else:
+            self.schedules.append(item)
+        self.save_change(f"A|{item.to_line()}")
+
+    def replace_row(self, row, item): #same kind only: task row or rule
+        if row[0] == "task":
+            self.schedules[row[1]] = item
+            self.save_change(f"U|{row[1]}|{item.to_line()}")
+        else:
+            self.rules[row[1]] = item
+            self.save_change(f"RU|{row[1]}|{item.to_line()}")
+
+    def remove_row(self, row): #remove the task or rule behind a line, returns it
+        if row[0] == "task":
+            self.save_change(f"D|{row[1]}")
+            return self.schedules.remove(row[1])
+        self.save_change(f"RD|{row[1]}")
+        return self.rules.pop(row[1])
+
+    def add_schedule(self):
+        item = self.read_form()
+        if item is None:
+            return
+
+        self.put_item(item)
+        self.notify(None, item)
         self.refresh_list()
         self.clear_form()
         messagebox.showinfo("Success", "Schedule added.")
 
     def update_selected(self):
-        idx = self.get_selected_index()
-        if idx is None:
+        row = self.get_selected_row()
+        if row is None:
             messagebox.showwarning("No selection", "Please select a schedule to update.")
             return
 
-        pet_raw = self.pet_entry.get()
-        date_raw = self.date_entry.get()
-        task_raw = self.task_entry.get()
-
-        validated = self.validate_pet_task(pet_raw, task_raw)
-        if validated is None:
+        item = self.read_form()
+        if item is None:
             return
-        pet, task = validated
 
-        clean_date = self.validate_datetime(date_raw)
-        if clean_date is None:
-            return
-
-        self.schedules[idx] = f"{pet}|{clean_date}|{task}"
-        self.save_to_file()
+        #same kind stays in its place, a task turned repeating (or back) moves
+        idx = self.get_selected_index()
+        old_item = self.row_item(row)
+        if isinstance(old_item, GroomingRule) and isinstance(item, GroomingRule):
+            item = item.with_skips(old_item.skips) #the form has no skipped dates
+        if (row[0] == "task") == isinstance(item, GroomingTask):
+            self.replace_row(row, item)
+        else:
+            self.remove_row(row)
+            self.put_item(item)
+            idx = None
+        self.notify(old_item, item)
         self.refresh_list()
-        self.listbox.selection_set(idx)
+        if idx is not None and self.view() == "all":
+            self.listbox.selection_set(idx)
         messagebox.showinfo("Success", "Schedule updated.")
 
     def delete_selected(self):
-        idx = self.get_selected_index()
-        if idx is None:
+        row = self.get_selected_row()
+        if row is None:
             messagebox.showwarning("No selection", "Please select a schedule to delete.")
             return
 
-        pet, date, task = self.safe_split(self.schedules[idx])
+        item = self.row_item(row)
+        if row[0] == "task":
+            question = "Delete this schedule?"
+        else:
+            question = f"Delete this repeating schedule ({item.describe()}) and all its dates?"
         ok = messagebox.askyesno(
             "Confirm Delete",
-            f"Delete this schedule?\n\nDate: {date}\nPet: {pet}\nTask: {task}"
+            f"{question}\n\nDate: {item.date_text()}\nPet: {item.pet}\nTask: {item.task}"
         )
         if not ok:
             return
 
-        self.schedules.pop(idx)
-        self.save_to_file()
+        old_item = self.remove_row(row)
+        self.notify(old_item, None)
         self.refresh_list()
         self.clear_form()
-        messagebox.showinfo("Success", "Schedule deleted.")
\ No newline at end of file
+        messagebox.showinfo("Success", "Schedule deleted.")
+
+    def skip_occurrence(self): #leave out one date of a repeating task
+        row = self.get_selected_row()
+        if row is None or row[0] != "occ":
+            messagebox.showwarning("No selection", "Please select a date of a repeating schedule (Today, Next due or Next days view).")
+            return
+
+        old_item = self.rules[row[1]]
+        item = old_item.with_skip(row[2].date())
+        self.replace_row(row, item)
+        self.notify(old_item, item)
+        self.refresh_list()
+        messagebox.showinfo("Success", f"Skipped {row[2].strftime(DATE_FORMAT)}.")
\ No newline at end of file
@@ -1,8 +1,16 @@
+import csv
+import math
+import os
+import threading
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 
 EXP_FILE = "expenses_data.txt"
+ID_FILE = "expenses_id.txt"  # stores the last ID given out (high-water mark)
 CATEGORIES = ["Food", "Medical", "Grooming", "Others"]
+TOMBSTONE = "DEL"  # "DEL|id" line marks a record as deleted
+COMPACT_MIN_DEAD = 500  # dead lines needed before the file is compacted
+FILTER_DELAY_MS = 250  # wait after the last key press before filtering
 
 
 def max_check(month, year):
@@ -19,14 +27,15 @@ def max_check(month, year):
             return 31
 
 
-def check_date_format_logic(date_text):
+def date_format_error(date_text):
+    # Same checks as check_date_format_logic, but returns the problem as
+    # text (None when the date is fine) so it works without the GUI
     # Check format structure (Chapter 4A split)
     parts = date_text.split("-")
 
     # Explicit comparison (Chapter 3)
     if len(parts) != 3:
-        messagebox.showerror("Error", "Format must be YYYY-MM-DD")
-        return False
+        return "Format must be YYYY-MM-DD"
 
     # List Indexing (Chapter 4 List)
     y_str = parts[0]
@@ -35,25 +44,19 @@ def check_date_format_logic(date_text):
 
     # Check if they are numbers (Chapter 4A isdigit)
     if not y_str.isdigit():
-        messagebox.showerror("Error", "Year must be a number")
-        return False
+        return "Year must be a number"
     if not m_str.isdigit():
-        messagebox.showerror("Error", "Month must be a number")
-        return False
+        return "Month must be a number"
     if not d_str.isdigit():
-        messagebox.showerror("Error", "Day must be a number")
-        return False
+        return "Day must be a number"
 
     # Check lengths (Chapter 5 len)
     if len(y_str) != 4:
-        messagebox.showerror("Error", "Year must be 4 digits")
-        return False
+        return "Year must be 4 digits"
     if len(m_str) != 2:
-        messagebox.showerror("Error", "Month must be 2 digits")
-        return False
+        return "Month must be 2 digits"
     if len(d_str) != 2:
-        messagebox.showerror("Error", "Day must be 2 digits")
-        return False
+        return "Day must be 2 digits"
 
     # Logic Range Check (Chapter 3 Comparison)
     year = int(y_str)
@@ -61,17 +64,517 @@ def check_date_format_logic(date_text):
     day = int(d_str)
 
     if month < 1 or month > 12:
-        messagebox.showerror("Error", "Month must be 1-12")
-        return False
+        return "Month must be 1-12"
 
     limit = max_check(month, year)
     if day < 1 or day > limit:
-        messagebox.showerror("Error", f"Invalid day. Max is {limit}")
-        return False
+        return f"Invalid day. Max is {limit}"
+
+    return None
 
+
+def check_date_format_logic(date_text):
+    # GUI version: shows the problem in a message box
+    error = date_format_error(date_text)
+    if error is not None:
+        messagebox.showerror("Error", error)
+        return False
     return True
 
 
+def expense_error(name, category, amt_str, date_str):
+    # Validates one expense entry without the GUI
+    # Returns (error text or None, amount)
+    if len(name) == 0:
+        return "Name cannot be empty", None
+
+    if not name.replace(" ", "").isalpha():
+        return "Name must be letters only", None
+
+    if category not in CATEGORIES:
+        return f"Category must be one of {', '.join(CATEGORIES)}", None
+
+    try:
+        amt = float(amt_str)
+        if amt <= 0 or not math.isfinite(amt):
+            raise ValueError
+    except ValueError:
+        return "Amount must be a positive number", None
+
+    error = date_format_error(date_str)
+    if error is not None:
+        return error, None
+
+    return None, amt
+
+
+class ExpenseIdAllocator:
+    # Hands out new record IDs without reading the whole expenses file.
+    # The last ID used is kept in a small sidecar file, so IDs keep going up
+    # after a restart and are never reused after a delete.
+    def __init__(self, id_file=ID_FILE, data_file=EXP_FILE):
+        self.id_file = id_file
+        self.data_file = data_file
+        self.last_id = None  # loaded on first use
+
+    def load(self):
+        try:
+            with open(self.id_file, "r") as f:
+                self.last_id = int(f.read().strip())
+        except (IOError, ValueError):
+            # First run (or broken sidecar): scan the data file once
+            self.last_id = self.scan_max_id()
+            self.save()
+
+    def sync(self, max_id):
+        # The store has just read every ID, so a stale sidecar (failed
+        # write, restored backup) can not hand out one already in use
+        try:
+            with open(self.id_file, "r") as f:
+                saved = int(f.read().strip())
+        except (IOError, ValueError):
+            saved = None
+        self.last_id = max(saved or 0, max_id, self.last_id or 0)
+        if self.last_id != saved:
+            try:
+                self.save()
+            except IOError:
+                pass  # kept in memory, the next new ID writes it again
+
+    def scan_max_id(self):
+        max_id = 0
+        try:
+            with open(self.data_file, "r") as f:
+                for line in f:
+                    parts = line.strip().split("|")
+                    if len(parts) >= 5 and parts[0].isdigit():
+                        max_id = max(max_id, int(parts[0]))
+        except IOError:
+            pass
+        return max_id
+
+    def save(self):
+        # IOError goes to the caller, the GUI shows "File error"
+        with open(self.id_file, "w") as f:
+            f.write(f"{self.last_id}\n")
+
+    def next_id(self):
+        if self.last_id is None:
+            self.load()
+        self.last_id += 1
+        self.save()
+        return self.last_id
+
+    def reserve(self, count):
+        # Reserves a block of IDs with one sidecar write, returns the first
+        if self.last_id is None:
+            self.load()
+        first = self.last_id + 1
+        self.last_id += count
+        self.save()
+        return first
+
+
+def iter_log(path=EXP_FILE):
+    # Yields every line of the expenses log split on "|" (Chapter 4C)
+    # Rows have 5 fields, tombstones are "DEL|id"
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                parts = line.strip().split("|")
+                if len(parts) >= 5:
+                    yield parts
+                elif len(parts) == 2 and parts[0] == TOMBSTONE:
+                    yield parts
+    except IOError:
+        return
+
+
+def read_expense_rows(path=EXP_FILE):
+    # Reads live rows "id|date|name|category|amount" (tombstones applied)
+    records = {}
+    for parts in iter_log(path):
+        if parts[0] == TOMBSTONE:
+            records.pop(parts[1], None)
+        else:
+            records[parts[0]] = parts
+    return list(records.values())
+
+
+class Expense:
+    # One expense record, parsed once when it is loaded.
+    # Amount is kept in whole cents so totals never drift.
+    def __init__(self, exp_id, date, name, category, cents):
+        self.exp_id = exp_id
+        self.date = date  # "YYYY-MM-DD"
+        self.name = name
+        self.category = category
+        self.cents = cents
+
+    @property
+    def amount(self):
+        return self.cents / 100
+
+    def to_line(self):
+        return f"{self.exp_id}|{self.date}|{self.name}|{self.category}|{self.amount:.2f}\n"
+
+    def show_row(self):
+        return f"{self.exp_id} | {self.date} | {self.name} | {self.category} | RM {self.amount:.2f}"
+
+
+def to_cents(amount_text):
+    try:
+        return round(float(amount_text) * 100)
+    except ValueError:
+        return 0
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    # Trigram index over pet names for the "Filter by Name" search.
+    # Each distinct name is indexed once and points at its expense IDs,
+    # so a query only looks at names that share all of its trigrams.
+    def __init__(self):
+        self.ids_by_name = {}  # lower-case name -> set of expense IDs
+        self.names_by_gram = {}  # trigram -> set of lower-case names
+
+        # Last query and its matching names. A longer query that contains
+        # the last one can only match a subset of those names.
+        self.last_query = None
+        self.last_names = set()
+
+    def add(self, name, exp_id):
+        key = name.lower()
+        ids = self.ids_by_name.get(key)
+        if ids is None:
+            ids = self.ids_by_name[key] = set()
+            for gram in trigrams(key):
+                self.names_by_gram.setdefault(gram, set()).add(key)
+            self.last_query = None  # new name, cached result is stale
+        ids.add(exp_id)
+
+    def remove(self, name, exp_id):
+        key = name.lower()
+        ids = self.ids_by_name.get(key)
+        if ids is None:
+            return
+        ids.discard(exp_id)
+        if not ids:
+            del self.ids_by_name[key]
+            for gram in trigrams(key):
+                names = self.names_by_gram[gram]
+                names.discard(key)
+                if not names:
+                    del self.names_by_gram[gram]
+            self.last_query = None
+
+    def matching_names(self, text):
+        text = text.lower()
+        if self.last_query is not None and self.last_query in text:
+            # Narrow down from the previous result
+            candidates = self.last_names
+        elif len(text) >= 3:
+            # Intersect trigram postings, smallest set first
+            postings = []
+            for gram in trigrams(text):
+                names = self.names_by_gram.get(gram)
+                if names is None:
+                    postings = []
+                    break
+                postings.append(names)
+            postings.sort(key=len)
+            candidates = set.intersection(*postings) if postings else set()
+        else:
+            # Too short for trigrams, check the distinct names only
+            candidates = self.ids_by_name.keys()
+
+        names = {name for name in candidates if text in name}
+        self.last_query = text
+        self.last_names = names
+        return names
+
+    def matching_ids(self, text):
+        ids = []
+        for name in self.matching_names(text):
+            ids.extend(self.ids_by_name[name])
+        ids.sort()
+        return ids
+
+
+class ExpenseRollups:
+    # Running totals keyed by (pet, category, year-month), kept up to date
+    # on every add and delete so totals never need a scan of the records.
+    def __init__(self):
+        # lower-case name -> {(category, "YYYY-MM"): [cents, count]}
+        self.by_name = {}
+        self.grand_cents = 0
+        self.grand_count = 0
+
+    def add(self, exp, sign=1):
+        cells = self.by_name.setdefault(exp.name.lower(), {})
+        cell = cells.setdefault((exp.category, exp.date[:7]), [0, 0])
+        cell[0] += sign * exp.cents
+        cell[1] += sign
+        self.grand_cents += sign * exp.cents
+        self.grand_count += sign
+        if cell[1] == 0:
+            del cells[(exp.category, exp.date[:7])]
+            if not cells:
+                del self.by_name[exp.name.lower()]
+
+    def remove(self, exp):
+        self.add(exp, -1)
+
+    def cells(self, names=None):
+        # Yields (name, category, month, cents, count) for the given names
+        if names is None:
+            names = self.by_name.keys()
+        for name in names:
+            for (cat, month), (cents, count) in self.by_name.get(name, {}).items():
+                yield name, cat, month, cents, count
+
+    def total(self, names=None, category=None, month=None):
+        # Total in cents, None means "any"
+        if names is None and category is None and month is None:
+            return self.grand_cents
+        total = 0
+        for name, cat, mon, cents, count in self.cells(names):
+            if category is not None and cat != category:
+                continue
+            if month is not None and mon != month:
+                continue
+            total += cents
+        return total
+
+    def breakdown(self, field, names=None):
+        # Totals grouped by "category" or "month" -> {key: cents}
+        result = {}
+        for name, cat, month, cents, count in self.cells(names):
+            key = cat if field == "category" else month
+            result[key] = result.get(key, 0) + cents
+        return result
+
+
+class ExpenseStore:
+    # Keeps every expense in memory after one read of the file.
+    # The file is an append-only log: adds append a row, deletes append a
+    # tombstone. Once enough dead lines pile up, a worker thread rewrites
+    # the file atomically without them.
+    def __init__(self, data_file=EXP_FILE, id_file=ID_FILE):
+        self.data_file = data_file
+        self.id_alloc = ExpenseIdAllocator(id_file, data_file)
+        self.records = {}  # id -> Expense, in file order
+        self.dead = 0  # deleted rows + tombstones still in the file
+        self.name_index = NameIndex()
+        self.rollups = ExpenseRollups()
+
+        # lock guards the file and the compaction state below
+        self.lock = threading.Lock()
+        self.compacting = False
+        self.pending = []  # lines appended while a compaction runs
+
+    def load(self):
+        self.records.clear()
+        self.dead = 0
+        max_id = 0
+        for row in iter_log(self.data_file):
+            if row[0] == TOMBSTONE:
+                self.dead += 1
+                if row[1].isdigit():
+                    max_id = max(max_id, int(row[1]))
+                if row[1].isdigit() and self.records.pop(int(row[1]), None):
+                    self.dead += 1
+                continue
+            if not row[0].isdigit():
+                continue
+            exp = Expense(int(row[0]), row[1], row[2], row[3], to_cents(row[4]))
+            if exp.exp_id in self.records:
+                self.dead += 1
+            self.records[exp.exp_id] = exp
+            max_id = max(max_id, exp.exp_id)
+        self.id_alloc.sync(max_id)
+
+        self.name_index = NameIndex()
+        self.rollups = ExpenseRollups()
+        for exp in self.records.values():
+            self.name_index.add(exp.name, exp.exp_id)
+            self.rollups.add(exp)
+
+    def get(self, exp_id):
+        return self.records.get(exp_id)
+
+    def all(self):
+        return list(self.records.values())
+
+    def matching(self, name_filter):
+        # Case-insensitive substring match on pet name, via the index
+        if name_filter == "":
+            return self.all()
+        return [self.records[i] for i in self.name_index.matching_ids(name_filter)]
+
+    def filter_names(self, name_filter):
+        # Names matching a filter, None when there is no filter
+        if name_filter == "":
+            return None
+        return self.name_index.matching_names(name_filter)
+
+    def total(self, name_filter="", category=None, month=None):
+        # Total in cents for any filter combination, from the rollups
+        return self.rollups.total(self.filter_names(name_filter), category, month)
+
+    def breakdown(self, field, name_filter=""):
+        return self.rollups.breakdown(field, self.filter_names(name_filter))
+
+    def add(self, date, name, category, amount):
+        exp = Expense(self.id_alloc.next_id(), date,
+                      name, category, round(amount * 100))
+        self.append(exp.to_line())
+        self.records[exp.exp_id] = exp
+        self.name_index.add(exp.name, exp.exp_id)
+        self.rollups.add(exp)
+        return exp
+
+    def delete(self, exp_id):
+        if exp_id not in self.records:
+            return None
+        # Append a tombstone instead of rewriting the file
+        self.append(f"{TOMBSTONE}|{exp_id}\n")
+        exp = self.records.pop(exp_id)
+        self.name_index.remove(exp.name, exp.exp_id)
+        self.rollups.remove(exp)
+        with self.lock:
+            self.dead += 2  # the old row and its tombstone
+        self.maybe_compact()
+        return exp
+
+    def append(self, text):
+        with self.lock:
+            with open(self.data_file, "a") as f:
+                f.write(text)
+            if self.compacting:
+                self.pending.append(text)
+
+    def import_csv(self, csv_path, error_path=None):
+        # Bulk import "date,name,category,amount" rows from a CSV file.
+        # The file is streamed twice, so memory use does not grow with its
+        # size: pass 1 validates and counts, then one block of IDs is
+        # reserved, pass 2 appends every good row with one buffered write.
+        # Bad rows go to an error report file instead of message boxes.
+        # Returns (rows imported, rows rejected, error report path or None).
+        if error_path is None:
+            error_path = csv_path + ".errors.txt"
+
+        good = 0
+        bad = 0
+        with open(csv_path, "r", newline="", encoding="utf-8-sig") as f_in, \
+                open(error_path, "w") as f_err:
+            for line_no, row, error in iter_csv_expenses(f_in):
+                if error is None:
+                    good += 1
+                else:
+                    bad += 1
+                    f_err.write(f"line {line_no}: {error} | {','.join(row)}\n")
+        if bad == 0:
+            os.remove(error_path)
+            error_path = None
+        if good == 0:
+            return 0, bad, error_path
+
+        next_id = self.id_alloc.reserve(good)
+        with open(csv_path, "r", newline="", encoding="utf-8-sig") as f_in, \
+                self.lock, open(self.data_file, "a", buffering=1 << 20) as f_out:
+            for line_no, row, error in iter_csv_expenses(f_in):
+                if error is not None:
+                    continue
+                exp = Expense(next_id, row[0], row[1], row[2], round(float(row[3]) * 100))
+                next_id += 1
+                line = exp.to_line()
+                f_out.write(line)
+                if self.compacting:
+                    self.pending.append(line)
+                self.records[exp.exp_id] = exp
+                self.name_index.add(exp.name, exp.exp_id)
+                self.rollups.add(exp)
+        return good, bad, error_path
+
+    def maybe_compact(self):
+        if self.compacting:
+            return
+        if self.dead < COMPACT_MIN_DEAD or self.dead < len(self.records):
+            return
+        with self.lock:
+            self.compacting = True
+            self.pending = []
+            snapshot = list(self.records.values())
+            dead_now = self.dead
+        worker = threading.Thread(target=self.compact,
+                                  args=(snapshot, dead_now), daemon=True)
+        worker.start()
+
+    def compact(self, snapshot, dead_now):
+        # Runs on a worker thread: write live rows to a temp file, then swap
+        # it in with os.replace so the file is never half written
+        tmp_file = self.data_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                for exp in snapshot:
+                    f.write(exp.to_line())
+                f.flush()
+                os.fsync(f.fileno())
+            with self.lock:
+                # Lines appended since the snapshot go at the end
+                with open(tmp_file, "a") as f:
+                    f.writelines(self.pending)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.data_file)
+                self.dead -= dead_now
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        finally:
+            with self.lock:
+                self.compacting = False
+                self.pending = []
+
+
+def iter_csv_expenses(f_in):
+    # Yields (line number, [date, name, category, amount], error or None)
+    # A first line of column names is used to find the columns, otherwise
+    # the order date,name,category,amount is assumed.
+    columns = ["date", "name", "category", "amount"]
+    order = [0, 1, 2, 3]
+    for line_no, raw in enumerate(csv.reader(f_in), start=1):
+        fields = [field.strip() for field in raw]
+        if line_no == 1 and set(columns) <= {x.lower() for x in fields}:
+            lowered = [x.lower() for x in fields]
+            order = [lowered.index(col) for col in columns]
+            continue
+        if not fields or fields == [""]:
+            continue
+        if len(fields) <= max(order):
+            yield line_no, fields, "Expected date,name,category,amount"
+            continue
+        row = [fields[i] for i in order]
+        error, amt = expense_error(row[1], row[2], row[3], row[0])
+        yield line_no, row, error
+
+
+# One resident store per run, shared by every visit to the expenses page
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = ExpenseStore()
+        _store.load()
+    return _store
+
+
 class PetExpenseTrackerApp:
     def __init__(self, master):
         self.master = master
@@ -86,21 +589,22 @@ class PetExpenseTrackerApp:
         self.lst_history = None
         self.lbl_total = None
 
+        self.store = get_store()
+        self.shown_ids = []  # expense ID of each Listbox row
+        self.filter_job = None  # pending debounced filter (after id)
+
         self.build_ui()
         self.refresh_list()
+        self.master.bind("<Destroy>", self.on_destroy)  # page switched away
+
+    def on_destroy(self, event):
+        # A pending filter would run against destroyed widgets
+        if event.widget is self.master:
+            self.cancel_filter_job()
 
     def load_records(self):
-        # Reads data from file (Chapter 4C)
-        records = []
-        try:
-            with open(EXP_FILE, "r") as f:
-                for line in f:
-                    parts = line.strip().split("|")
-                    if len(parts) >= 5:
-                        records.append(parts)
-        except IOError:
-            pass
-        return records
+        # Raw rows straight from file (Chapter 4C)
+        return read_expense_rows(EXP_FILE)
 
     def save_data(self):
         # Get values (Chapter 8)
@@ -109,48 +613,15 @@ class PetExpenseTrackerApp:
         amt_str = self.e_amount.get().strip()
         date_str = self.e_date.get().strip()
 
-        # Validation (Chapter 3)
-        if len(name) == 0:
-            messagebox.showerror("Error", "Name cannot be empty")
-            return
-
-        if not name.replace(" ", "").isalpha():
-            messagebox.showerror("Error", "Name must be letters only")
-            return
-
-        try:
-            amt = float(amt_str)
-            if amt <= 0:
-                raise ValueError
-        except ValueError:
-            messagebox.showerror("Error", "Amount must be a positive number")
-            return
-
-        # Date Check (Chapter 4A String Processing)
-        if not check_date_format_logic(date_str):
+        # Validation (Chapter 3), shared with the CSV importer
+        error, amt = expense_error(name, cat, amt_str, date_str)
+        if error is not None:
+            messagebox.showerror("Error", error)
             return
 
-        # ID generator (Chapter 5 and 6)
-        data = self.load_records()
-
-        # Standard loop to find max ID
-        max_id = 0
-        if len(data) > 0:
-            for row in data:
-                # row[0] is the ID
-                curr_id = int(row[0])
-                if curr_id > max_id:
-                    max_id = curr_id
-            new_id = max_id + 1
-        else:
-            new_id = 1
-
-        # Append to file (Chapter 4C)
+        # Append to file and memory (ID comes from the sidecar high-water mark)
         try:
-            with open(EXP_FILE, "a") as f:
-                # String formatting (Chapter 4A)
-                line = f"{new_id}|{date_str}|{name}|{cat}|{amt:.2f}\n"
-                f.write(line)
+            exp = self.store.add(date_str, name, cat, amt)
         except IOError:
             messagebox.showerror("Error", "File error")
             return
@@ -159,7 +630,12 @@ class PetExpenseTrackerApp:
         self.e_name.delete(0, tk.END)
         self.e_amount.delete(0, tk.END)
         messagebox.showinfo("Success", "Saved successfully")
-        self.refresh_list()
+
+        # Only the new row is added to the list
+        if self.current_filter.lower() in exp.name.lower():
+            self.lst_history.insert(tk.END, exp.show_row())
+            self.shown_ids.append(exp.exp_id)
+        self.update_total()
 
     def delete_item(self):
         # Get selected index (Chapter 8)
@@ -171,53 +647,119 @@ class PetExpenseTrackerApp:
             return
 
         idx = sel[0]
-        data = self.load_records()
-
-        if idx < len(data):
-            # Access ID using explicit index row[0]
-            item = data[idx]
+        if idx < len(self.shown_ids):
+            exp_id = self.shown_ids[idx]
             confirm = messagebox.askyesno(
-                "Confirm", f"Delete record ID {item[0]}?")
+                "Confirm", f"Delete record ID {exp_id}?")
 
             if confirm:
-                data.pop(idx)  # Remove item (Chapter 5)
+                try:
+                    self.store.delete(exp_id)
+                except IOError:
+                    messagebox.showerror("Error", "File error")
+                    return
 
-                # Rewrite file (Chapter 4C)
-                with open(EXP_FILE, "w") as f:
-                    for row in data:
-                        f.write("|".join(row) + "\n")
-                self.refresh_list()
+                # Only the deleted row is removed from the list
+                self.lst_history.delete(idx)
+                self.shown_ids.pop(idx)
+                self.update_total()
 
     def refresh_list(self):
+        # Redraw from memory, no file access
         self.lst_history.delete(0, tk.END)
-        data = self.load_records()
-        total = 0.0
+        self.shown_ids = []
 
-        for row in data:
-            try:
-                # row[4] is the amount RM
-                val = float(row[4])
-            except:
-                val = 0.0
-
-            # Filter logic (Chapter 4A String methods)
-            if self.current_filter != "":
-                if self.current_filter.lower() not in row[2].lower():
-                    continue
+        for exp in self.store.matching(self.current_filter):
+            self.shown_ids.append(exp.exp_id)
+            self.lst_history.insert(tk.END, exp.show_row())
 
-            total += val
+        self.update_total()
 
-            # Use Explicit List Indexing row[0], row[1]...
-            text = f"{row[0]} | {row[1]} | {row[2]} | {row[3]} | RM {val:.2f}"
-            self.lst_history.insert(tk.END, text)
+    def update_total(self):
+        # Comes from the rollups, not from the shown rows
+        cents = self.store.total(self.current_filter)
+        self.lbl_total.config(text=f"Total: RM {cents / 100:.2f}")
 
-        self.lbl_total.config(text=f"Total: RM {total:.2f}")
+    def import_csv(self):
+        path = filedialog.askopenfilename(
+            title="Import expenses CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            good, bad, error_path = self.store.import_csv(path)
+        except IOError:
+            messagebox.showerror("Error", "File error")
+            return
+
+        self.refresh_list()
+        text = f"Imported {good} records."
+        if bad > 0:
+            text += f"\n{bad} rows were rejected, see:\n{error_path}"
+        messagebox.showinfo("Import", text)
+
+    def show_summary(self):
+        # Summary panel: totals by category and by month for the filter
+        by_cat = self.store.breakdown("category", self.current_filter)
+        by_month = self.store.breakdown("month", self.current_filter)
+
+        lines = ["By Category"]
+        for cat in CATEGORIES:
+            lines.append(f"  {cat}: RM {by_cat.get(cat, 0) / 100:.2f}")
+        for cat in sorted(by_cat):
+            if cat not in CATEGORIES:
+                lines.append(f"  {cat}: RM {by_cat[cat] / 100:.2f}")
+
+        lines.append("")
+        lines.append("By Month")
+        for month in sorted(by_month, reverse=True):
+            lines.append(f"  {month}: RM {by_month[month] / 100:.2f}")
+
+        title = "All pets" if self.current_filter == "" else f"Name filter: {self.current_filter}"
+        self.show_lines("Expense Summary", title, lines)
+
+    def show_report(self):
+        # Yearly report from the NumPy column engine (optional dependency)
+        try:
+            import Expense_Analytics
+        except ImportError:
+            messagebox.showerror("Error", "Yearly report needs NumPy.\nInstall it with: pip install numpy")
+            return
+
+        columns = Expense_Analytics.ExpenseColumns.from_store(self.store)
+        lines = Expense_Analytics.format_report(columns.yearly_report())
+        self.show_lines("Yearly Report", "All pets, by year", lines)
+
+    def show_lines(self, win_title, heading, lines):
+        # Small pop-up window with a list of text lines
+        win = tk.Toplevel(self.master)
+        win.title(win_title)
+        tk.Label(win, text=heading, font=("Arial", 12, "bold")).pack(pady=5)
+
+        lst = tk.Listbox(win, width=45, height=20)
+        lst.pack(fill="both", expand=True, padx=10, pady=5)
+        for line in lines:
+            lst.insert(tk.END, line)
+
+        tk.Button(win, text="Close", command=win.destroy).pack(pady=5)
 
     def apply_filter(self):
+        self.cancel_filter_job()
         self.current_filter = self.e_filter.get().strip()
         self.refresh_list()
 
+    def on_filter_key(self, event):
+        # Search as you type, but only once typing pauses
+        self.cancel_filter_job()
+        self.filter_job = self.master.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def cancel_filter_job(self):
+        if self.filter_job is not None:
+            self.master.after_cancel(self.filter_job)
+            self.filter_job = None
+
     def reset_filter(self):
+        self.cancel_filter_job()
         self.current_filter = ""
         self.e_filter.delete(0, tk.END)
         self.refresh_list()
@@ -262,6 +804,8 @@ class PetExpenseTrackerApp:
         # Save Btn
         tk.Button(f_input, text="Save Record", bg="#1dbc5f", fg="white", font=("Arial", 10),
                   command=self.save_data).grid(row=4, column=1, pady=10, sticky="w")
+        tk.Button(f_input, text="Import CSV", font=("Arial", 10),
+                  command=self.import_csv).grid(row=4, column=0, pady=10, sticky="e")
 
     def build_record_list(self):
         # History List
@@ -279,6 +823,7 @@ class PetExpenseTrackerApp:
         tk.Label(f_ctrl, text="Filter by Name:").pack(side="left")
         self.e_filter = tk.Entry(f_ctrl, width=15)
         self.e_filter.pack(side="left", padx=5)
+        self.e_filter.bind("<KeyRelease>", self.on_filter_key)
         tk.Button(f_ctrl, text="Check",
                   command=self.apply_filter).pack(side="left")
         tk.Button(f_ctrl, text="Reset", command=self.reset_filter).pack(
@@ -290,6 +835,10 @@ class PetExpenseTrackerApp:
 
         tk.Button(f_bot, text="Delete Selected", bg="#d52424",
                   fg="white", command=self.delete_item).pack(side="left")
+        tk.Button(f_bot, text="Summary",
+                  command=self.show_summary).pack(side="left", padx=5)
+        tk.Button(f_bot, text="Yearly Report",
+                  command=self.show_report).pack(side="left")
         self.lbl_total = tk.Label(
             f_bot, text="Total: RM 0.00", font=("Arial", 12, "bold"))
         self.lbl_total.pack(side="right")
@@ -0,0 +1,252 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+from Grooming_Schedule import GroomingRule
+
+VET_REMIND_DAYS = 1 # remind this many days before a vet appointment
+VET_REMIND_HOUR = 9 # ... at this hour
+GROOM_REMIND_MINUTES = 30 # remind this long before a grooming task
+VET_HORIZON_DAYS = 14 # vet appointments are loaded this far ahead at a time
+GROOM_HORIZON_DAYS = 14 # one-off grooming tasks too
+MAX_SLEEP_MS = 60 * 60 * 1000 # longest single root.after wait (clock changes)
+
+
+# -------------------------
+#        SCHEDULER
+# -------------------------
+class ReminderScheduler:
+    # Min-heap of (fire time, seq, key). It only wakes at the earliest
+    # deadline, there is no polling. Cancelled or moved reminders stay in
+    # the heap and are skipped when they reach the top (lazy delete).
+    def __init__(self, notify):
+        self.notify = notify # called with the reminder text
+        self.heap = []
+        self.entries = {} # key -> (fire_at, seq, message, action)
+        self.seq = itertools.count()
+        self.lock = threading.Condition()
+
+        self.tk_root = None # set by attach_tk
+        self.after_job = None
+
+        self.groom_counts = {} # grooming task -> how many identical tasks
+
+    def schedule(self, key, fire_at, message=None, action=None, wake=True):
+        # Add or move a reminder, action (if given) is called when it fires
+        with self.lock:
+            seq = next(self.seq)
+            self.entries[key] = (fire_at, seq, message, action)
+            heapq.heappush(self.heap, (fire_at, seq, key))
+            if wake:
+                self.wake()
+
+    def cancel(self, key, wake=True):
+        with self.lock:
+            if self.entries.pop(key, None) is not None and wake:
+                self.wake()
+
+    def next_time(self): # earliest live deadline, or None
+        with self.lock:
+            while self.heap:
+                fire_at, seq, key = self.heap[0]
+                entry = self.entries.get(key)
+                if entry is not None and entry[1] == seq:
+                    return fire_at
+                heapq.heappop(self.heap) # stale
+            return None
+
+    def pop_due(self, now=None): # remove and return every entry due by now
+        if now is None:
+            now = datetime.now()
+        due = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                fire_at, seq, key = heapq.heappop(self.heap)
+                entry = self.entries.get(key)
+                if entry is not None and entry[1] == seq:
+                    del self.entries[key]
+                    due.append(entry)
+        return due
+
+    def fire_due(self): # reminders due together are shown as one message
+        messages = []
+        for fire_at, seq, message, action in self.pop_due():
+            if message is not None:
+                messages.append(message)
+            if action is not None:
+                action()
+        if messages:
+            self.notify("\n".join(messages))
+
+    # -------------------------
+    #      TK INTEGRATION
+    # -------------------------
+
+    def attach_tk(self, root): # drive the scheduler from the Tk mainloop
+        self.tk_root = root
+        self.arm()
+
+    def wake(self): # the earliest deadline may have changed
+        if self.tk_root is not None:
+            self.arm()
+        else:
+            with self.lock:
+                self.lock.notify_all()
+
+    def arm(self): # one root.after for the next deadline only
+        if self.after_job is not None:
+            self.tk_root.after_cancel(self.after_job)
+            self.after_job = None
+        fire_at = self.next_time()
+        if fire_at is None:
+            return
+        wait_ms = int((fire_at - datetime.now()).total_seconds() * 1000)
+        wait_ms = max(0, min(wait_ms, MAX_SLEEP_MS))
+        self.after_job = self.tk_root.after(wait_ms, self.on_tk_timer)
+
+    def on_tk_timer(self):
+        self.after_job = None
+        self.fire_due()
+        self.arm()
+
+    # -------------------------
+    #      HEADLESS DAEMON
+    # -------------------------
+
+    def run_forever(self): # block and fire reminders, for use without Tk
+        while True:
+            with self.lock:
+                fire_at = self.next_time()
+                if fire_at is None:
+                    self.lock.wait()
+                else:
+                    wait = (fire_at - datetime.now()).total_seconds()
+                    if wait > 0:
+                        self.lock.wait(min(wait, MAX_SLEEP_MS / 1000))
+            self.fire_due()
+
+    def start_daemon(self):
+        worker = threading.Thread(target=self.run_forever, daemon=True)
+        worker.start()
+        return worker
+
+    # -------------------------
+    #    VET APPOINTMENTS
+    # -------------------------
+
+    def track_vet(self, logic):
+        # Schedule reminders for the next VET_HORIZON_DAYS, then keep up with
+        # changes through the logic's listeners
+        self.vet_logic = logic
+        logic.listeners.append(self.vet_changed)
+        self.load_vet_window(datetime.now().date())
+
+    def load_vet_window(self, start):
+        # start..start+horizon from the date index; a refill entry at the
+        # end of the window loads the next one
+        self.vet_horizon = start + timedelta(days=VET_HORIZON_DAYS)
+        ids = self.vet_logic.between(start.isoformat(), self.vet_horizon.isoformat())
+        for item in self.vet_logic.get_items(ids):
+            self.add_vet(item, wake=False)
+        refill_at = datetime.combine(self.vet_horizon, datetime.min.time())
+        self.schedule("vet-refill", refill_at,
+                      action=lambda: self.load_vet_window(self.vet_horizon + timedelta(days=1)))
+
+    def add_vet(self, item, wake=True):
+        reminder = vet_reminder(item)
+        if reminder is not None and item[2] <= self.vet_horizon.isoformat():
+            self.schedule(("vet", item[0]), reminder[0], reminder[1], wake=wake)
+
+    def vet_changed(self, old, new): # listener: old/new record, None for add/delete
+        if old is not None:
+            self.cancel(("vet", old[0]))
+        if new is not None:
+            self.add_vet(new)
+
+    # -------------------------
+    #     GROOMING TASKS
+    # -------------------------
+
+    def track_grooming(self, grooming):
+        # grooming is Grooming_Schedule.get_grooming(), its listeners keep us
+        # current. Repeating tasks are one entry each (the next occurrence),
+        # one-off tasks are loaded GROOM_HORIZON_DAYS at a time like vet ones.
+        self.grooming = grooming
+        for rule in grooming.rules:
+            self.grooming_changed(None, rule, wake=False)
+        grooming.listeners.append(self.grooming_changed)
+        self.load_grooming_window(datetime.now())
+
+    def load_grooming_window(self, start):
+        # tasks in start..start+horizon from the date index; the refill entry
+        # fires early enough for the first task of the next window
+        self.groom_horizon = start + timedelta(days=GROOM_HORIZON_DAYS)
+        table = self.grooming.table
+        for row in table.rows_between(start, self.groom_horizon):
+            self.grooming_changed(None, table[row], wake=False)
+        refill_at = self.groom_horizon - timedelta(minutes=GROOM_REMIND_MINUTES)
+        self.schedule("groom-refill", refill_at,
+                      action=lambda: self.load_grooming_window(self.groom_horizon))
+
+    def in_groom_window(self, item): # rules always, tasks before the horizon
+        return isinstance(item, GroomingRule) or (
+            isinstance(item.when, datetime) and item.when < self.groom_horizon)
+
+    def add_grooming(self, item, after=None, wake=True):
+        # Only the next occurrence of a repeating task is in the heap, the
+        # one after it is scheduled when this one fires
+        reminder = grooming_reminder(item, after)
+        if reminder is not None:
+            fire_at, when, message = reminder
+            self.schedule(("groom", item), fire_at, message, wake=wake,
+                          action=lambda: self.add_grooming(item, when + timedelta(minutes=1)))
+
+    def grooming_changed(self, old, new, wake=True): # listener: old/new GroomingTask or GroomingRule
+        # tasks past the horizon are left for the window that covers them
+        if old is not None and not self.in_groom_window(old):
+            old = None
+        if new is not None and not self.in_groom_window(new):
+            new = None
+        if old is not None:
+            count = self.groom_counts.get(old, 0) - 1
+            if count <= 0:
+                self.groom_counts.pop(old, None)
+                self.cancel(("groom", old), wake=wake)
+            else:
+                self.groom_counts[old] = count
+        if new is not None:
+            self.groom_counts[new] = self.groom_counts.get(new, 0) + 1
+            self.add_grooming(new, wake=wake)
+
+
+def vet_reminder(item): # (fire time, text) for [id, pet, date, clinic, notes]
+    try:
+        day = datetime.strptime(item[2], "%Y-%m-%d")
+    except ValueError:
+        return None
+    if day.date() < datetime.now().date(): # already passed
+        return None
+    fire_at = day - timedelta(days=VET_REMIND_DAYS) + timedelta(hours=VET_REMIND_HOUR)
+    fire_at = max(fire_at, datetime.now())
+    return fire_at, f"Vet appointment for {item[1]} at {item[3]} on {item[2]}"
+
+
+def grooming_reminder(item, after=None): # (fire time, task time, text) for the next occurrence
+    now = datetime.now()
+    when = item.next_after(after or now)
+    if when is None: # bad date or already passed
+        return None
+    fire_at = max(when - timedelta(minutes=GROOM_REMIND_MINUTES), now)
+    return fire_at, when, f"Grooming for {item.pet} at {when:%Y-%m-%d %H:%M}: {item.task}"
+
+
+# run on its own as a headless reminder daemon
+if __name__ == "__main__":
+    import Grooming_Schedule
+    import Vet_Appointment_Log
+
+    scheduler = ReminderScheduler(lambda message: print(f"[{datetime.now():%Y-%m-%d %H:%M}] {message}", flush=True))
+    scheduler.track_vet(Vet_Appointment_Log.get_logic())
+    scheduler.track_grooming(Grooming_Schedule.get_grooming())
+    scheduler.run_forever()
@@ -1,61 +1,486 @@
 # -------------------------
 #          IMPORT
 # -------------------------
+import atexit
+import math
+import os
+import re
+from bisect import bisect_left, bisect_right, insort
+import threading
 import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
-
-FILE_NAME = 'appointment_data.txt'
+from itertools import islice
+
+FILE_NAME = 'appointment_data.txt' # snapshot
+JOURNAL_FILE = 'appointment_data.journal' # changes since the snapshot
+TOMBSTONE = 'DEL' # "DEL|id" line marks an appointment as deleted
+NEXT_ID_MARK = '@N' # "@N|next id" first snapshot line, so deleted IDs stay used
+COMMIT_WINDOW = 0.2 # seconds, journal writes in this window share one fsync
+CHECKPOINT_OPS = 1000 # journal entries before they are folded into the snapshot
+PAGE_SIZE = 6 # appointments per page
+PAGER_WINDOW = 5 # numbered page buttons shown at once
+SEARCH_DELAY_MS = 150 # wait after the last key press before searching
+# how much a word counts in each field: pet name, clinic name, reason notes
+FIELD_WEIGHTS = ((1, 3), (3, 2), (4, 1))
 
 # -------------------------
 #       LOGIC CLASS
 # -------------------------
 class VetAppointmentLogic:
     def __init__(self):
-        self.appointment_lists = []
+        # Only the IDs and where each record sits in the snapshot file are
+        # kept in memory. A page reads just its own rows from disk.
+        self.order = {} # id -> None, live IDs in display order
+        self.offsets = {} # id -> byte offset of its line in the snapshot
+        self.changed = {} # id -> record added/edited since the last checkpoint
+        self.next_id = 1 # IDs never change and are never reused
+
+        # Date index: (appointment_date, int id) sorted, for the whole list
+        # and per pet (lower-case name), kept current on add/edit/delete
+        self.by_date = []
+        self.by_pet = {}
+
+        # Booking indexes for double-booking checks:
+        # (clinic, date) and (pet, date), lower-case names -> set of IDs
+        self.by_clinic_day = {}
+        self.by_pet_day = {}
+
+        # Full-text index: word -> {id: weight}, plus every word sorted so
+        # a prefix ("lu" for "luna") is a bisect range
+        self.postings = {}
+        self.vocab = []
+
+        # Write-ahead journal: every add/edit/delete is one line, the same
+        # format as the snapshot. Lines wait in self.pending and are written
+        # together (group commit) with a single fsync.
+        self.lock = threading.RLock()
+        self.pending = []
+        self.commit_timer = None
+        self.journal_ops = 0 # journal lines since the last checkpoint
+        self.write_failed = False
+
+        # Called as listener(old, new) after every add/edit/delete, old is
+        # None for an add and new is None for a delete (reminders, calendar)
+        self.listeners = []
+
         self.read_file_data() # call a function
 
-    # read file data
+    # read file data: index the snapshot, then replay the journal on top
     def read_file_data(self): # reading the file data
-        self.appointment_lists.clear()
+        with self.lock:
+            self.order.clear()
+            self.offsets.clear()
+            self.changed.clear()
+            self.next_id = 1
+            self.by_date = []
+            self.by_pet = {}
+            self.by_clinic_day = {}
+            self.by_pet_day = {}
+            self.postings = {}
+            self.vocab = []
+            found = self.index_snapshot()
+            self.journal_ops = self.read_journal()
+            if self.journal_ops >= CHECKPOINT_OPS:
+                try:
+                    self.checkpoint()
+                except OSError:
+                    pass # the journal is still there, it is folded in next time
+        return found
+
+    def index_snapshot(self): # one pass, keeps byte offsets instead of records
+        found = True
+        fields = {} # id -> record, only until the indexes are built
         try:
-            with open(FILE_NAME, "r") as f: # try open file success # "r" is reading file
-                for line in f:
-                    if line.strip():
-                        self.appointment_lists.append(line.strip().split('|')) # separate the information
-            return True
+            with open(FILE_NAME, "rb") as f: # try open file success # "rb" is reading bytes
+                offset = 0
+                for raw in f:
+                    line = raw.strip()
+                    head, sep, rest = line.partition(b'|')
+                    if head == NEXT_ID_MARK.encode() and rest.isdigit():
+                        self.next_id = max(self.next_id, int(rest))
+                    elif head == TOMBSTONE.encode():
+                        self.remove_id(rest.decode())
+                        fields.pop(rest.decode(), None)
+                    elif head.isdigit() and rest.count(b'|') == 3:
+                        app_id = head.decode()
+                        self.order[app_id] = None
+                        self.offsets[app_id] = offset
+                        fields[app_id] = line.decode("utf-8").split('|')
+                        self.next_id = max(self.next_id, int(app_id) + 1)
+                    offset += len(raw)
         except IOError:
-            return False
-
-    def save_file(self): # save the file
+            found = False
+
+        # build the sorted indexes in one go instead of one insert per line
+        for item in fields.values():
+            key = (item[2], int(item[0]))
+            self.by_date.append(key)
+            self.by_pet.setdefault(item[1].lower(), []).append(key)
+            self.booking_add(item)
+            self.text_add(item, sort_vocab=False)
+        self.by_date.sort()
+        for dates in self.by_pet.values():
+            dates.sort()
+        self.vocab = sorted(self.postings)
+        return found
+
+    def read_journal(self): # returns number of journal lines
+        # a last line without its newline was cut off by a crash: it is not
+        # applied, and is truncated so the next append starts a new line
+        count = 0
+        good = 0 # end of the last complete line
         try:
-            with open(FILE_NAME, "w") as f:
-                # loop through current list and rewrite everything with new ID
-                for idx, item in enumerate(self.appointment_lists):
-                    item[0] = str(idx + 1)
-                    # join the list back into a string
-                    line = "|".join(item) + "\n"
-                    f.write(line)
-            return True
+            with open(JOURNAL_FILE, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break
+                    good += len(raw)
+                    line = raw.decode("utf-8").strip()
+                    if line:
+                        item = line.split('|') # separate the information
+                        self.apply_line(item)
+                        count += 1
+                torn = good < f.seek(0, os.SEEK_END)
+            if torn:
+                with open(JOURNAL_FILE, "r+b") as f:
+                    f.truncate(good)
+                    f.flush()
+                    os.fsync(f.fileno())
         except IOError:
-            return False
+            pass
+        return count
+
+    def apply_line(self, item):
+        # A later line for the same ID replaces the earlier one,
+        # a "DEL|id" line removes it
+        if item[0] == TOMBSTONE and len(item) == 2:
+            if item[1] in self.order:
+                self.index_remove(self.get_item(item[1]))
+            self.remove_id(item[1])
+        elif len(item) == 5 and item[0].isdigit():
+            if item[0] in self.order:
+                self.index_remove(self.get_item(item[0]))
+            self.order[item[0]] = None
+            self.changed[item[0]] = item
+            self.index_add(item)
+            self.next_id = max(self.next_id, int(item[0]) + 1)
+
+    def remove_id(self, app_id):
+        self.order.pop(app_id, None)
+        self.offsets.pop(app_id, None)
+        self.changed.pop(app_id, None)
+
+    def index_add(self, item):
+        key = (item[2], int(item[0]))
+        insort(self.by_date, key)
+        insort(self.by_pet.setdefault(item[1].lower(), []), key)
+        self.booking_add(item)
+        self.text_add(item)
+
+    def index_remove(self, item):
+        key = (item[2], int(item[0]))
+        remove_sorted(self.by_date, key)
+        dates = self.by_pet.get(item[1].lower())
+        if dates is not None:
+            remove_sorted(dates, key)
+            if not dates:
+                del self.by_pet[item[1].lower()]
+        self.booking_remove(item)
+        self.text_remove(item)
+
+    def booking_add(self, item):
+        self.by_clinic_day.setdefault((item[3].lower(), item[2]), set()).add(item[0])
+        self.by_pet_day.setdefault((item[1].lower(), item[2]), set()).add(item[0])
+
+    def booking_remove(self, item):
+        for index, key in ((self.by_clinic_day, (item[3].lower(), item[2])),
+                           (self.by_pet_day, (item[1].lower(), item[2]))):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(item[0])
+                if not ids:
+                    del index[key]
+
+    def text_add(self, item, sort_vocab=True):
+        for word, weight in item_words(item).items():
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = {}
+                if sort_vocab:
+                    insort(self.vocab, word)
+            ids[item[0]] = weight
+
+    def text_remove(self, item):
+        for word in item_words(item):
+            ids = self.postings.get(word)
+            if ids is None:
+                continue
+            ids.pop(item[0], None)
+            if not ids:
+                del self.postings[word]
+                remove_sorted(self.vocab, word)
+
+    def read_at(self, f, offset): # read one snapshot line at a byte offset
+        f.seek(offset)
+        return f.readline().decode("utf-8").strip().split('|')
+
+    def append_line(self, item): # queue only the changed record for the journal
+        with self.lock:
+            # join the list back into a string
+            self.pending.append("|".join(item) + "\n")
+            if self.commit_timer is None:
+                self.commit_timer = threading.Timer(COMMIT_WINDOW, self.flush)
+                self.commit_timer.daemon = True
+                self.commit_timer.start()
+        # False when the last group commit could not be written
+        return not self.write_failed
+
+    def flush(self): # group commit: write all pending lines, one fsync
+        with self.lock:
+            if self.commit_timer is not None:
+                self.commit_timer.cancel()
+                self.commit_timer = None
+            if not self.pending:
+                return True
+            lines = self.pending
+            self.pending = []
+            try:
+                with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.journal_ops += len(lines)
+                if self.journal_ops >= CHECKPOINT_OPS:
+                    self.checkpoint()
+                self.write_failed = False
+            except OSError:
+                # keep the lines for the next try, replaying twice is harmless
+                self.pending = lines + self.pending
+                self.write_failed = True
+            return not self.write_failed
+
+    def checkpoint(self): # fold the journal into a new snapshot (lock held)
+        tmp_name = FILE_NAME + ".tmp"
+        new_offsets = {}
+        with open(tmp_name, "wb") as f_out:
+            f_out.write(f"{NEXT_ID_MARK}|{self.next_id}\n".encode("utf-8"))
+            old = open(FILE_NAME, "rb") if self.offsets else None
+            try:
+                for app_id in self.order:
+                    item = self.changed.get(app_id)
+                    if item is None:
+                        item = self.read_at(old, self.offsets[app_id])
+                    new_offsets[app_id] = f_out.tell()
+                    f_out.write(("|".join(item) + "\n").encode("utf-8"))
+            finally:
+                if old is not None:
+                    old.close()
+            f_out.flush()
+            os.fsync(f_out.fileno())
+        os.replace(tmp_name, FILE_NAME) # atomic swap, old snapshot stays valid until here
+        self.offsets = new_offsets
+        self.changed.clear()
+        open(JOURNAL_FILE, "w").close()
+        self.journal_ops = 0
 
     def add_data(self, item):
-        self.appointment_lists.append(item)
-        return self.save_file()
+        with self.lock:
+            item[0] = str(self.next_id)
+            self.next_id += 1
+            self.order[item[0]] = None
+            self.changed[item[0]] = item
+            self.index_add(item)
+        self.notify(None, item)
+        return self.append_line(item)
+
+    def edit_data(self, app_id, item):
+        with self.lock:
+            if app_id not in self.order:
+                return False
+            item[0] = app_id
+            old = self.get_item(app_id)
+            self.index_remove(old)
+            self.changed[app_id] = item
+            self.index_add(item)
+        self.notify(old, item)
+        return self.append_line(item)
+
+    def delete_data(self, app_id):
+        with self.lock:
+            if app_id not in self.order:
+                return False
+            old = self.get_item(app_id)
+            self.index_remove(old)
+            self.remove_id(app_id)
+        self.notify(old, None)
+        return self.append_line([TOMBSTONE, app_id])
+
+    def notify(self, old, new):
+        for listener in self.listeners:
+            listener(old, new)
+
+    # -------------------------
+    #     DATE QUERIES
+    # -------------------------
+
+    def today_pos(self, today=None): # first index at or after today
+        if today is None:
+            today = datetime.now().strftime("%Y-%m-%d")
+        return bisect_left(self.by_date, (today, 0))
+
+    def upcoming(self, n, today=None): # next n appointments from today on
+        with self.lock:
+            pos = self.today_pos(today)
+            return [str(key[1]) for key in self.by_date[pos:pos + n]]
+
+    def between(self, start, end): # IDs with start <= date <= end, by date
+        with self.lock:
+            lo = bisect_left(self.by_date, (start, 0))
+            hi = bisect_right(self.by_date, (end, float("inf")))
+            return [str(key[1]) for key in self.by_date[lo:hi]]
+
+    def pet_history(self, pet_name, start="", end="9999-99-99"): # one pet, by date
+        with self.lock:
+            dates = self.by_pet.get(pet_name.lower(), [])
+            lo = bisect_left(dates, (start, 0))
+            hi = bisect_right(dates, (end, float("inf")))
+            return [str(key[1]) for key in dates[lo:hi]]
+
+    # -------------------------
+    #   DOUBLE BOOKING CHECKS
+    # -------------------------
+
+    def find_conflicts(self, pet_name, clinic_name, date, app_id=None):
+        # Other appointments on the same day at the same clinic / for the
+        # same pet, two dict lookups. app_id is left out (the one being edited).
+        with self.lock:
+            same_clinic = self.by_clinic_day.get((clinic_name.lower(), date), set()) - {app_id}
+            same_pet = self.by_pet_day.get((pet_name.lower(), date), set()) - {app_id}
+            return sorted(same_clinic, key=int), sorted(same_pet, key=int)
+
+    def all_conflicts(self):
+        # Every double booking: list of (kind, name, date, IDs)
+        with self.lock:
+            found = []
+            for kind, index in (("Clinic", self.by_clinic_day), ("Pet", self.by_pet_day)):
+                for (name, date), ids in index.items():
+                    if len(ids) > 1:
+                        found.append((kind, name, date, sorted(ids, key=int)))
+            found.sort(key=lambda conflict: (conflict[2], conflict[0], conflict[1]))
+            return found
+
+    # -------------------------
+    #     FULL-TEXT SEARCH
+    # -------------------------
+
+    def search(self, query):
+        # IDs matching every word of the query, best first. Each query word
+        # matches any indexed word it is a prefix of. Score is the field
+        # weight times how rare the word is (idf), ties go to newer IDs.
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self.lock:
+            total = max(1, len(self.order))
+            scores = None
+            for term in sorted(set(terms)):
+                term_scores = {}
+                lo = bisect_left(self.vocab, term)
+                hi = bisect_left(self.vocab, term + "\uffff")
+                for word in self.vocab[lo:hi]:
+                    ids = self.postings[word]
+                    idf = math.log(1 + total / len(ids))
+                    bonus = 2 if word == term else 1 # whole word beats prefix
+                    for app_id, weight in ids.items():
+                        term_scores[app_id] = term_scores.get(app_id, 0) + weight * idf * bonus
+                if scores is None:
+                    scores = term_scores
+                else:
+                    # keep only IDs that match every word
+                    scores = {app_id: score + term_scores[app_id]
+                              for app_id, score in scores.items() if app_id in term_scores}
+                if not scores:
+                    return []
+            return sorted(scores, key=lambda app_id: (-scores[app_id], -int(app_id)))
+
+    def count(self, mode="all"):
+        with self.lock:
+            if mode == "upcoming":
+                return len(self.by_date) - self.today_pos()
+            if mode == "past":
+                return self.today_pos()
+            return len(self.order)
+
+    def get_item(self, app_id):
+        return self.get_items([app_id])[0]
+
+    def get_items(self, ids): # records for some IDs, one open of the snapshot
+        with self.lock:
+            items = []
+            f = None
+            try:
+                for app_id in ids:
+                    item = self.changed.get(app_id)
+                    if item is None and app_id in self.offsets:
+                        if f is None:
+                            f = open(FILE_NAME, "rb")
+                        item = self.read_at(f, self.offsets[app_id])
+                    items.append(item)
+            finally:
+                if f is not None:
+                    f.close()
+            return items
+
+    def get_page(self, page, size=PAGE_SIZE, mode="all"): # only the rows of one page
+        # mode "all" is insertion order, "upcoming" is soonest first from
+        # today, "past" is most recent first before today
+        with self.lock:
+            head = page * size
+            if mode == "upcoming":
+                pos = self.today_pos() + head
+                keys = self.by_date[pos:pos + size]
+                ids = [str(key[1]) for key in keys]
+            elif mode == "past":
+                pos = self.today_pos() - head
+                keys = self.by_date[max(0, pos - size):max(0, pos)]
+                ids = [str(key[1]) for key in reversed(keys)]
+            else:
+                ids = list(islice(self.order, head, head + size))
+            return self.get_items(ids)
+
+
+def tokenize(text): # lower-case words and numbers
+    return re.findall(r"[a-z0-9]+", text.lower())
+
 
-    def edit_data(self, idx, item):
-        self.appointment_lists[idx] = item
-        return self.save_file()
+def item_words(item): # word -> weight for one appointment record
+    words = {}
+    for field, weight in FIELD_WEIGHTS:
+        if field == 4 and item[4] == 'null': # empty note placeholder
+            continue
+        for word in tokenize(item[field]):
+            words[word] = words.get(word, 0) + weight
+    return words
 
-    def delete_data(self, real_idx):
-        if 0 <= real_idx < len(self.appointment_lists):
-            del self.appointment_lists[real_idx]
-            return self.save_file()
-        return False
 
-    def get_list(self):
-        return self.appointment_lists
+def remove_sorted(keys, key): # remove one key from a sorted list
+    i = bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+
+# One shared logic object per run, so pending journal writes are never
+# missed by a second reader, and flushed when the program exits
+_logic = None
+
+
+def get_logic():
+    global _logic
+    if _logic is None:
+        _logic = VetAppointmentLogic()
+        atexit.register(_logic.flush)
+    return _logic
 
 
 # -------------------------
@@ -65,17 +490,30 @@ class VetAppointmentApp:
     def __init__(self, master):
         self.master = master
         
-        self.logic = VetAppointmentLogic()
+        self.logic = get_logic()
 
         # Create a container/box frame inside the master
         self.container = tk.Frame(self.master)
         self.container.pack(fill="both", expand=True)
+        self.container.bind("<Destroy>", self.on_destroy) # page switched away
 
         # list data
         self.page_appointment_lists = []  
 
         self.list_pages = 0  # This Page
         self.pages = 0  # Total Pages
+        self.list_mode = tk.StringVar(value="all") # all / upcoming / past / search
+        self.search_text = tk.StringVar()
+        self.search_ids = [] # ranked search results
+        self.search_job = None # pending debounced search (after id)
+        self.last_mode = "all" # mode to go back to when the search is cleared
+
+        # The list view is built once and its widgets are reused for every
+        # page, the add/edit form is built when opened and destroyed after
+        self.list_view = None
+        self.form_view = None
+        self.row_widgets = [] # PAGE_SIZE rows, each a dict of widgets
+        self.page_buttons = [] # PAGER_WINDOW numbered buttons
         self.vet_page()
 
     # -------------------------
@@ -83,104 +521,228 @@ class VetAppointmentApp:
     # -------------------------
 
     def clear_content(self):
-        # Clears the container/box frame only
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-
-
-    # Show List
-    def show_list(self):
-        # Refresh data from logic
-        current_list = self.logic.get_list()
-        self.count_pages(current_list)
+        # Hides the list view and removes the form view (list widgets are kept)
+        self.cancel_search_job()
+        if self.form_view is not None:
+            self.form_view.destroy()
+            self.form_view = None
+        if self.list_view is not None:
+            self.list_view.pack_forget()
+
+    # Build the list view once: PAGE_SIZE row blocks, pager and add button
+    def build_list_view(self):
+        self.list_view = tk.Frame(self.container)
+
+        label_frame = tk.Frame(self.list_view)
+        label_frame.pack(pady=5)
 
-        list_frame = tk.LabelFrame(self.container,
+        # list modes, driven by the date index
+        for text, mode in (("All", "all"), ("Upcoming", "upcoming"), ("Past", "past")):
+            tk.Radiobutton(label_frame,
+                           text=text,
+                           variable=self.list_mode,
+                           value=mode,
+                           indicatoron=0,
+                           width=10,
+                           font=("Arial", 10),
+                           command=self.change_mode).pack(side="left", padx=2)
+
+        # search box, results update as you type
+        tk.Label(label_frame, text="Search:", font=("Arial", 10)).pack(side="left", padx=(10, 2))
+        search_entry = tk.Entry(label_frame, textvariable=self.search_text,
+                                width=15, font=("Arial", 10))
+        search_entry.pack(side="left")
+        search_entry.bind("<KeyRelease>", self.on_search_key)
+
+        list_frame = tk.LabelFrame(self.list_view,
                                    padx=5, pady=5, font=("Arial", 10, "bold")
                                    )
         list_frame.pack(padx=5, pady=5, fill="both", expand=True)
 
-        if not current_list: # not record in the page
-            text_null = tk.Label(list_frame,
-                                 text="Vet Appointment Data is Null",
-                                 font=("Arial", 20),
-                                 fg='#999',
-                                 height=3,
-                                 width=25)
-            text_null.pack(pady=20)
-        else:
-            head = self.list_pages * 6 # max 6 record
-            tail = 6 + head
-            self.page_appointment_lists = current_list[head:tail]
-            for i, [id, pet_name, appointment_date, clinic_name, reason_notes] in enumerate(self.page_appointment_lists):
-                block_frame = tk.LabelFrame(list_frame,
-                                            padx=10,
-                                            pady=10,
-                                            font=("Arial", 10, "bold")
-                                            )
-                block_frame.pack(fill="x", padx=10, pady=10)
-
-                
-                text = tk.Label(block_frame,
-                                text=f"Pet: {pet_name} | Date: {appointment_date}\n"
-                                     f"Clinic: {clinic_name} | Note: {reason_notes}",
+        self.text_null = tk.Label(list_frame,
+                                  font=("Arial", 20),
+                                  fg='#999',
+                                  height=3,
+                                  width=25)
+
+        for i in range(PAGE_SIZE):
+            self.row_widgets.append(self.build_row(list_frame))
+
+        self.build_pager()
+
+        self.add_frame = tk.Frame(self.list_view)
+        self.add_frame.pack(pady=5)
+        btn_add = tk.Button(self.add_frame,
+                            text="Add Appointment",
+                            bg="#1dbc5f",
+                            fg="#fff",
+                            font=("Arial", 12),
+                            width=18,
+                            height=2,
+                            command=lambda: self.appointment_page())
+        btn_add.pack(side="left", padx=5, pady=10)
+
+        btn_conflicts = tk.Button(self.add_frame,
+                                  text="Conflicts",
+                                  font=("Arial", 12),
+                                  width=10,
+                                  height=2,
+                                  command=self.show_conflicts)
+        btn_conflicts.pack(side="left", padx=5, pady=10)
+
+    # Windowed pager: first / prev / numbered window / next / last / jump-to
+    def build_pager(self):
+        self.pager_frame = tk.LabelFrame(self.list_view,
+                                         padx=5,
+                                         pady=5,
+                                         )
+
+        self.btn_first = tk.Button(self.pager_frame, text="<<", font=("Arial", 9),
+                                   command=lambda: self.change_page(0))
+        self.btn_first.grid(row=1, column=0)
+        self.btn_prev = tk.Button(self.pager_frame, text="<", font=("Arial", 9),
+                                  command=lambda: self.change_page(self.list_pages - 1))
+        self.btn_prev.grid(row=1, column=1)
+
+        for i in range(PAGER_WINDOW):
+            page_button = tk.Button(self.pager_frame,
+                                    font=("Arial", 9),
+                                    width=3,
+                                    )
+            page_button.grid(row=1, column=i + 2)
+            self.page_buttons.append(page_button)
+
+        col = PAGER_WINDOW + 2
+        self.btn_next = tk.Button(self.pager_frame, text=">", font=("Arial", 9),
+                                  command=lambda: self.change_page(self.list_pages + 1))
+        self.btn_next.grid(row=1, column=col)
+        self.btn_last = tk.Button(self.pager_frame, text=">>", font=("Arial", 9),
+                                  command=lambda: self.change_page(self.pages - 1))
+        self.btn_last.grid(row=1, column=col + 1)
+
+        self.jump_page = tk.StringVar()
+        jump_entry = tk.Entry(self.pager_frame, textvariable=self.jump_page,
+                              width=5, font=("Arial", 9))
+        jump_entry.grid(row=1, column=col + 2, padx=(10, 2))
+        jump_entry.bind("<Return>", lambda event: self.jump_to_page())
+        tk.Button(self.pager_frame, text="Go", font=("Arial", 9),
+                  command=self.jump_to_page).grid(row=1, column=col + 3)
+
+        self.lbl_pages = tk.Label(self.pager_frame, font=("Arial", 9), fg="#888")
+        self.lbl_pages.grid(row=2, column=0, columnspan=col + 4)
+
+    # One appointment block, its text and commands are set in show_list
+    def build_row(self, list_frame):
+        block_frame = tk.LabelFrame(list_frame,
+                                    padx=10,
+                                    pady=10,
+                                    font=("Arial", 10, "bold")
+                                    )
+
+        text = tk.Label(block_frame,
+                        font=("Arial", 9),
+                        height=2,
+                        justify="left",
+                        padx=2)
+        text.pack(side="left", fill="x", expand=True)
+
+        btn_frame_inner = tk.Frame(block_frame)
+        btn_frame_inner.pack(side="right")
+
+        edit_button = tk.Button(btn_frame_inner,
+                                text="Edit",
                                 font=("Arial", 9),
-                                height=2,
-                                justify="left",
-                                padx=2)
-                text.pack(side="left", fill="x", expand=True)
-
-                btn_frame_inner = tk.Frame(block_frame)
-                btn_frame_inner.pack(side="right")
-
-                edit_button = tk.Button(btn_frame_inner,
-                                        text="Edit",
-                                        font=("Arial", 9),
-                                        command=lambda
-                                        p=pet_name,
-                                        d=appointment_date,
-                                        c=clinic_name,
-                                        r=reason_notes,
-                                        idx=i: self.appointment_page(p, d, c, r, idx)
-                                        )
-                edit_button.pack(side="left", padx=2)
-
-                del_button = tk.Button(btn_frame_inner,
-                                       bg="red",
-                                       fg="white",
-                                       text=" X ",
-                                       font=("Arial", 9, "bold"),
-                                       command=lambda idx=i: self.del_list(idx)
-                                       )
-                del_button.pack(side="left", padx=2)
-
-            btn_frame = tk.LabelFrame(self.container,
-                                      padx=5,
-                                      pady=5,
-                                      )
-            btn_frame.pack(padx=5, pady=5)
-
-            for i in range(self.pages):
-                if self.list_pages == i:
-                    page_button = tk.Button(btn_frame,
-                                            text=f"{i + 1}",
-                                            fg="#000",
-                                            font=("Arial", 9),
-                                            command=lambda idx=i: self.change_page(
-                                                idx)
-                                            )
-
-                    page_button.grid(row=1, column=i)
-                else:
-                    page_button = tk.Button(btn_frame,
-                                            text=f"{i + 1}",
-                                            fg="#888",
-                                            font=("Arial", 9),
-                                            command=lambda idx=i: self.change_page(
-                                                idx)
-                                            )
+                                )
+        edit_button.pack(side="left", padx=2)
+
+        del_button = tk.Button(btn_frame_inner,
+                               bg="red",
+                               fg="white",
+                               text=" X ",
+                               font=("Arial", 9, "bold"),
+                               )
+        del_button.pack(side="left", padx=2)
+
+        return {"frame": block_frame, "text": text,
+                "edit": edit_button, "delete": del_button}
 
-                    page_button.grid(row=1, column=i)
+    # Show List: rebind the existing rows to the current page
+    def show_list(self):
+        # Refresh data from logic, only the rows of this page are read
+        mode = self.list_mode.get()
+        if mode == "search":
+            total = len(self.search_ids)
+        else:
+            total = self.logic.count(mode)
+        self.count_pages(total)
+        if self.list_pages >= self.pages:
+            self.list_pages = self.pages - 1
+
+        if mode == "search":
+            head = self.list_pages * PAGE_SIZE
+            self.page_appointment_lists = self.logic.get_items(self.search_ids[head:head + PAGE_SIZE])
+        else:
+            self.page_appointment_lists = self.logic.get_page(self.list_pages, PAGE_SIZE, mode) # max 6 record
+
+        if total == 0: # not record in the page
+            empty_text = {"upcoming": "No Upcoming Appointments",
+                          "past": "No Past Appointments",
+                          "search": "No Matching Appointments"}
+            self.text_null.config(text=empty_text.get(mode, "Vet Appointment Data is Null"))
+            self.text_null.pack(pady=20)
+        else:
+            self.text_null.pack_forget()
+
+        for i, row in enumerate(self.row_widgets):
+            if i >= len(self.page_appointment_lists):
+                row["frame"].pack_forget()
+                continue
+
+            [id, pet_name, appointment_date, clinic_name, reason_notes] = self.page_appointment_lists[i]
+            row["text"].config(text=f"Pet: {pet_name} | Date: {appointment_date}\n"
+                                    f"Clinic: {clinic_name} | Note: {reason_notes}")
+            row["edit"].config(command=lambda
+                               p=pet_name,
+                               d=appointment_date,
+                               c=clinic_name,
+                               r=reason_notes,
+                               app_id=id: self.appointment_page(p, d, c, r, app_id))
+            row["delete"].config(command=lambda app_id=id: self.del_list(app_id))
+            if not row["frame"].winfo_manager():
+                # rows are always shown from the top, so packing keeps the order
+                row["frame"].pack(fill="x", padx=10, pady=10)
+
+        self.update_pager(total)
+
+    # Update the pager in place: the numbered buttons show a window of pages
+    # around the current one, so the button count never depends on the data
+    def update_pager(self, total):
+        if total == 0:
+            self.pager_frame.pack_forget()
+            return
+
+        first = self.list_pages - PAGER_WINDOW // 2
+        first = max(0, min(first, self.pages - PAGER_WINDOW))
+        for i, page_button in enumerate(self.page_buttons):
+            idx = first + i
+            if idx >= self.pages:
+                page_button.grid_remove()
+                continue
+            page_button.config(text=f"{idx + 1}",
+                               fg="#000" if idx == self.list_pages else "#888",
+                               command=lambda idx=idx: self.change_page(idx))
+            page_button.grid()
+
+        at_start = "disabled" if self.list_pages == 0 else "normal"
+        at_end = "disabled" if self.list_pages >= self.pages - 1 else "normal"
+        self.btn_first.config(state=at_start)
+        self.btn_prev.config(state=at_start)
+        self.btn_next.config(state=at_end)
+        self.btn_last.config(state=at_end)
+        self.lbl_pages.config(text=f"Page {self.list_pages + 1} of {self.pages} ({total} appointments)")
+
+        if not self.pager_frame.winfo_manager():
+            self.pager_frame.pack(padx=5, pady=5, before=self.add_frame)
 
     # Reset table
     def reset_table(self, pet, year, month, day, clinic, Reason):
@@ -192,7 +754,7 @@ class VetAppointmentApp:
         Reason.set("")
 
     # submit and edit btn
-    def submit_data(self, pet, year, month, day, clinic, Reason, idx=None):
+    def submit_data(self, pet, year, month, day, clinic, Reason, app_id=None):
         pet_name = pet.get()
         clinic_name = clinic.get()
         reason_note = Reason.get()
@@ -219,6 +781,21 @@ class VetAppointmentApp:
             messagebox.showerror("Error", "The date input is incorrect or not a number.\nPlease re-enter!")
             return
 
+        # Double booking check (hash index lookup, no scan)
+        same_clinic, same_pet = self.logic.find_conflicts(pet_name, clinic_name, date, app_id)
+        if same_clinic or same_pet:
+            lines = []
+            for item in self.logic.get_items(same_clinic):
+                lines.append(f"Clinic busy: {item[1]} at {item[3]}")
+            for item in self.logic.get_items(same_pet):
+                lines.append(f"Pet busy: {item[1]} at {item[3]}")
+            booked = messagebox.askyesno("Possible Double Booking",
+                                         f"Already booked on {date}:\n"
+                                         + "\n".join(lines[:6])
+                                         + "\n\nSave anyway?")
+            if not booked:
+                return
+
         check = messagebox.askokcancel("Please Check Message", f"Please Check Message\n"
                                                   f"Pet Name: {pet_name}\n"
                                                   f"Clinic Name: {clinic_name}\n"
@@ -228,16 +805,16 @@ class VetAppointmentApp:
                 reason_note = 'null'
             
             success = False
-            if idx is None:
-                # use placeholder '0' for ID because save_file() fixes ID automatically
+            if app_id is None:
+                # use placeholder '0' for ID because add_data() gives the next free ID
                 item = ['0', pet_name, date, clinic_name, reason_note]
                 success = self.logic.add_data(item)
                 if success:
                     messagebox.showinfo("success", 'Added Successfully!')
             else:
                 # Update list in memory then save
-                item = [str(idx + 1), pet_name, date, clinic_name, reason_note]
-                success = self.logic.edit_data(idx, item)
+                item = [app_id, pet_name, date, clinic_name, reason_note]
+                success = self.logic.edit_data(app_id, item)
                 if success:
                     messagebox.showinfo("success", 'Edit Successfully!')
 
@@ -246,14 +823,31 @@ class VetAppointmentApp:
 
             self.vet_page()
 
+    # report of every double booking
+    def show_conflicts(self):
+        conflicts = self.logic.all_conflicts()
+
+        win = tk.Toplevel(self.master)
+        win.title("Double Bookings")
+        tk.Label(win,
+                 text=f"{len(conflicts)} double booking(s) found",
+                 font=("Arial", 12, "bold")).pack(pady=5)
+
+        report = tk.Listbox(win, width=60, height=20)
+        report.pack(fill="both", expand=True, padx=10, pady=5)
+        for kind, name, date, ids in conflicts:
+            items = self.logic.get_items(ids)
+            pets = ", ".join(f"{item[1]} ({item[3]})" for item in items if item)
+            report.insert(tk.END, f"{date} | {kind}: {name} | {pets}")
+
+        tk.Button(win, text="Close", font=("Arial", 10), command=win.destroy).pack(pady=5)
+
     # del btn with confirmation
-    def del_list(self, idx):
+    def del_list(self, app_id):
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this appointment?")
 
         if confirm:
-            real_idx = (self.list_pages * 6) + idx
-            
-            success = self.logic.delete_data(real_idx)
+            success = self.logic.delete_data(app_id)
             
             if success:
                 self.vet_page()
@@ -262,13 +856,57 @@ class VetAppointmentApp:
 
     # page break
     def change_page(self, idx):
-        self.list_pages = idx
-        self.vet_page()
+        self.list_pages = max(0, min(idx, self.pages - 1))
+        self.show_list()
+
+    def change_mode(self):
+        self.search_text.set("")
+        self.search_ids = []
+        self.last_mode = self.list_mode.get()
+        self.list_pages = 0
+        self.show_list()
+
+    def on_search_key(self, event):
+        # search as you type, once typing pauses
+        self.cancel_search_job()
+        self.search_job = self.master.after(SEARCH_DELAY_MS, self.run_search)
+
+    def cancel_search_job(self):
+        if self.search_job is not None:
+            self.master.after_cancel(self.search_job)
+            self.search_job = None
+
+    def on_destroy(self, event):
+        if event.widget is self.container: # a pending search would use dead widgets
+            self.cancel_search_job()
+
+    def run_search(self):
+        self.search_job = None
+        query = self.search_text.get().strip()
+        if query == "":
+            self.search_ids = []
+            self.list_mode.set(self.last_mode)
+        else:
+            if self.list_mode.get() != "search":
+                self.last_mode = self.list_mode.get()
+            self.search_ids = self.logic.search(query)
+            self.list_mode.set("search")
+        self.list_pages = 0
+        self.show_list()
+
+    def jump_to_page(self):
+        try:
+            page = int(self.jump_page.get())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a page number.")
+            return
+        self.jump_page.set("")
+        self.change_page(page - 1)
 
     # calculate the number of pages
-    def count_pages(self, current_list):
-        self.pages = len(current_list) // 6
-        if self.pages == 0 or len(current_list) % 6 != 0:
+    def count_pages(self, total):
+        self.pages = total // PAGE_SIZE
+        if self.pages == 0 or total % PAGE_SIZE != 0:
             self.pages = self.pages + 1
 
     # -------------------------
@@ -278,29 +916,22 @@ class VetAppointmentApp:
     # show appointment page
     def vet_page(self):
         self.clear_content()
-        label_frame = tk.Frame(self.container)
-        label_frame.pack(pady=5)
+        if self.list_view is None:
+            self.build_list_view()
+        self.list_view.pack(fill="both", expand=True)
 
+        if self.list_mode.get() == "search": # data may have changed since
+            self.search_ids = self.logic.search(self.search_text.get())
 
         self.show_list()
 
-        btn_frame_btns = tk.Frame(self.container)
-        btn_frame_btns.pack(pady=5)
-        btn_add = tk.Button(btn_frame_btns,
-                            text="Add Appointment",
-                            bg="#1dbc5f",
-                            fg="#fff",
-                            font=("Arial", 12),
-                            width=18,
-                            height=2,
-                            command=lambda: self.appointment_page())
-        btn_add.pack(pady=10)
-
     # add and edit appointment page 
-    def appointment_page(self, name=None, date=None, clinic=None, Notes=None, idx=None):
+    def appointment_page(self, name=None, date=None, clinic=None, Notes=None, app_id=None):
         self.clear_content()
+        self.form_view = tk.Frame(self.container)
+        self.form_view.pack(fill="both", expand=True)
 
-        label_frame = tk.Frame(self.container)
+        label_frame = tk.Frame(self.form_view)
         label_frame.pack(pady=10)
 
         # return button
@@ -325,7 +956,7 @@ class VetAppointmentApp:
                           )
         label1.grid(row=1, column=2)
 
-        table_frame = tk.LabelFrame(self.container,
+        table_frame = tk.LabelFrame(self.form_view,
                                     font=("Arial", 10, "bold"),
                                     )
         table_frame.pack(padx=10, pady=10, fill="x")
@@ -452,6 +1083,6 @@ class VetAppointmentApp:
                                fg="#fff",
                                font=("Arial", 12),
                                bg="#1dbc5f",
-                               command=lambda: self.submit_data(petName, year, month, day, clinicName, ReasonNote, idx)
+                               command=lambda: self.submit_data(petName, year, month, day, clinicName, ReasonNote, app_id)
                                )
         submit_btn.pack(side="left", padx=10)
\ No newline at end of file
@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
+from datetime import datetime
 import Feeding_Tracker
 import Grooming_Schedule
 import Vet_Appointment_Log
 import Pet_Expense_Tracker
+import Reminder_Scheduler
+import Calendar_View
 
 # setup the main window example from chapter 8
 root = tk.Tk()
@@ -18,6 +21,55 @@ def clear_window():
         widget.destroy()
 
 
+def show_reminder(message):
+    messagebox.showinfo("Reminder", message)
+
+
+# reminders for vet appointments and grooming tasks, woken by root.after
+# only at the next due time (see Reminder_Scheduler.py)
+scheduler = Reminder_Scheduler.ReminderScheduler(show_reminder)
+scheduler.track_vet(Vet_Appointment_Log.get_logic())
+scheduler.track_grooming(Grooming_Schedule.get_grooming())
+scheduler.attach_tk(root)
+
+# day-bucket index for the calendar page, kept current by the same listeners
+calendar_index = Calendar_View.CalendarIndex(Vet_Appointment_Log.get_logic(), Grooming_Schedule.get_grooming())
+
+
+# feeding ticker: one root.after to the next minute that has a feeding,
+# re-armed whenever a schedule is added or deleted
+feeding = Feeding_Tracker.get_feeding()
+feeding_job = None
+
+
+def arm_feeding_ticker(*changed):
+    global feeding_job
+    if feeding_job is not None:
+        root.after_cancel(feeding_job)
+        feeding_job = None
+    now = datetime.now()
+    minute = now.hour * 60 + now.minute
+    next_minute = feeding.index.next_slot(minute + 1)
+    if next_minute is None:
+        return
+    wait = (next_minute - minute) % Feeding_Tracker.DAY_MINUTES or Feeding_Tracker.DAY_MINUTES
+    feeding_job = root.after((wait * 60 - now.second) * 1000, feeding_tick)
+
+
+def feeding_tick():
+    global feeding_job
+    feeding_job = None
+    now = datetime.now()
+    minute = now.hour * 60 + now.minute
+    arm_feeding_ticker() # before the dialog, which waits for the user
+    if feeding.index.due_at(minute):
+        messagebox.showinfo("Feeding", Feeding_Tracker.due_message(feeding.index, minute))
+
+
+feeding.listeners.append(arm_feeding_ticker)
+arm_feeding_ticker()
+
+
 # GUI main menu
 
 def main_menu():
@@ -47,6 +99,10 @@ def main_menu():
         "Arial", 14), width=22, height=2, command=expenses_page)
     btn4.pack(pady=10)
 
+    btn5 = tk.Button(btn_frame, text="Calendar", bg="#e08a1e", fg="white", font=(
+        "Arial", 14), width=22, height=2, command=calendar_page)
+    btn5.pack(pady=10)
+
 
 def feeding_page():
     clear_window()
@@ -114,5 +170,21 @@ def expenses_page():
     Pet_Expense_Tracker.PetExpenseTrackerApp(content_frame)
 
 
+def calendar_page():
+    clear_window()
+    header = tk.Label(root, text="Calendar", bg="#e08a1e",
+                      fg="white", font=("Arial", 24, "bold"), width=30, height=2)
+    header.pack(fill="x")
+
+    btn_back = tk.Button(root, text="Back", bg="#555555", fg="white", font=(
+        "Arial", 12), width=12, command=main_menu)
+    btn_back.pack(side="bottom", pady=20)
+
+    content_frame = tk.Frame(root)
+    content_frame.pack(fill="both", expand=True)
+
+    Calendar_View.CalendarApp(content_frame, calendar_index)
+
+
 main_menu()
 root.mainloop()